@@ -0,0 +1,288 @@
+"""Offline benchmark suite for the voice blender.
+
+Runs on CPU against the deterministic stub backend (kokoro_blender_stub) by
+default, or against the real model with --real. Every benchmark reports the
+median time in milliseconds and is compared with the stored baseline; a
+benchmark slower than baseline * (1 + --tolerance) fails the run:
+
+    python benchmarks/run_benchmarks.py                    # compare with the baseline
+    python benchmarks/run_benchmarks.py --update-baseline  # store new numbers
+    python benchmarks/run_benchmarks.py --real --model kokoro.onnx --voices voices-v1.0.bin
+
+Baselines are per machine and backend (benchmarks/baseline_stub.json,
+benchmarks/baseline_real.json); refresh them when the hardware changes.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import kokoro_blender_core as core
+import kokoro_blender_stub
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_TEXT = (
+    "The quick brown fox jumps over the lazy dog. "
+    "Blending voices should feel instant while the sliders move. "
+    "Every preview starts with the first sentence."
+)
+
+
+def measure(fn, repeat, number=1, setup=None):
+    """Median milliseconds per call of fn over repeat rounds of number calls."""
+    rounds = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - started) * 1000 / number)
+    return statistics.median(rounds)
+
+
+def wait_for(app, condition, timeout=60.0):
+    """Process Qt events until condition() holds."""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("benchmark step timed out")
+        app.processEvents()
+        time.sleep(0.001)
+
+
+class Bench:
+    def __init__(self, args, work_dir):
+        self.args = args
+        self.work_dir = work_dir
+        self.rng = np.random.default_rng(0)
+        self.results = {}
+
+        import kokoro_voice_blender_gui as gui
+        from PyQt5.QtWidgets import QApplication
+        self.gui = gui
+        self.app = QApplication.instance() or QApplication(sys.argv)
+        gui.DEFAULT_MODEL_PATH = args.model
+        gui.DEFAULT_VOICES_PATH = args.voices
+        gui.DEFAULT_CONFIG_DIR = os.path.join(work_dir, "configs")
+
+    def record(self, name, milliseconds):
+        self.results[name] = round(milliseconds, 4)
+        print(f"{name:32s} {milliseconds:10.3f} ms")
+
+    def open_window(self):
+        """Construct the window and wait for the model; returns (window, seconds to ready)."""
+        started = time.perf_counter()
+        window = self.gui.KokoroVoiceBlender()
+        window.speculative_cb.setChecked(False)  # Keep background renders out of the timings
+        window.show()
+        wait_for(self.app, lambda: window.pipeline is not None)
+        return window, time.perf_counter() - started
+
+    def run(self):
+        repeat = self.args.repeat
+        self.bench_startup(repeat)
+        window, _ = self.open_window()
+        window.synthesis_cache.disk_dir = None
+        try:
+            self.bench_blend(window, repeat)
+            self.bench_drag_storm(window, repeat)
+            self.bench_config(window, repeat)
+            self.bench_preset_switch(window, repeat)
+            self.bench_reflow(window, repeat)
+            self.bench_time_to_first_audio(window, repeat)
+        finally:
+            window.close()
+        return self.results
+
+    def bench_startup(self, repeat):
+        times = []
+        for _ in range(max(3, repeat // 5)):
+            window, seconds = self.open_window()
+            times.append(seconds * 1000)
+            window.close()
+        self.record("startup_to_model_ready", statistics.median(times))
+
+    def bench_blend(self, window, repeat):
+        blender = window.blender
+        weights = np.zeros(len(blender.names), dtype=np.float32)
+        weights[self.rng.choice(len(weights), 10, replace=False)] = 0.1
+        self.record("blend_10_voices", measure(lambda: blender.blend(weights), repeat, number=200))
+
+        batch = self.rng.random((64, len(blender.names))).astype(np.float32)
+        batch /= batch.sum(axis=1, keepdims=True)
+        self.record("blend_batch_64", measure(lambda: blender.blend_batch(batch), repeat, number=20))
+
+    def bench_drag_storm(self, window, repeat):
+        """200 slider events with normalization on, as a fast drag across several sliders produces."""
+        window.normalize_cb.setChecked(True)
+        events = [(int(self.rng.integers(len(window.voices))), int(self.rng.integers(101))) for _ in range(200)]
+
+        def storm():
+            for index, value in events:
+                window.weight_model.values[index] = value
+                window.adjust_sliders_to_sum_one(window.voices[index])
+
+        self.record("drag_storm_200_events", measure(storm, repeat))
+
+    def bench_config(self, window, repeat):
+        path = os.path.join(self.work_dir, "bench_config.json")
+
+        def save():
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(window.current_config(), f, indent=4)
+
+        def load():
+            with open(path, "r", encoding="utf-8") as f:
+                window.apply_config(json.load(f))
+
+        self.record("config_save", measure(save, repeat, number=20))
+        self.record("config_load", measure(load, repeat, number=20))
+
+    def bench_preset_switch(self, window, repeat):
+        """Switch between indexed presets and get the blend a preview would use."""
+        for index in range(20):
+            values = core.draw_random_values(len(window.voices), count=5)
+            config = dict(window.current_config(), voice_weights={voice: int(value) / 100 for voice, value in zip(window.voices, values)})
+            with open(os.path.join(window.config_dir, f"bench_preset_{index:02d}.json"), "w", encoding="utf-8") as f:
+                json.dump(config, f, indent=4)
+        window.refresh_presets()
+        window.config_library.precompute(window.blender)
+        names = itertools.cycle([name for name in window.config_library.names() if name.startswith("bench_preset_")])
+
+        def switch():
+            window.apply_preset(next(names))
+            window.blend(window.current_slider_values())
+
+        self.record("preset_switch", measure(switch, repeat, number=20))
+
+    def bench_reflow(self, window, repeat):
+        columns = iter(range(10 ** 9))
+
+        def reflow():
+            window.columns = next(columns) % 5 + 1
+            window.update_slider_layout()
+
+        self.record("slider_reflow", measure(reflow, repeat, number=10))
+
+    def bench_time_to_first_audio(self, window, repeat):
+        """Preview click to the first samples reaching the player, cache cold."""
+        window.text_input.setPlainText(BENCH_TEXT)
+        first_audio = []
+        play = window.player.play
+
+        def recording_play(samples, sr):
+            first_audio.append(time.perf_counter())
+            play(samples, sr)
+
+        window.player.play = recording_play
+
+        def cold_cache():
+            first_audio.clear()
+            # Sentences still being cached after the last preview would warm the cache
+            window.synthesis_worker.cancel("sentences")
+            wait_for(self.app, lambda: not window.synthesis_worker.is_busy("sentences"))
+            window.synthesis_cache.clear()
+
+        def preview():
+            window.preview_blend()
+            wait_for(self.app, lambda: first_audio and not window.synthesis_worker.is_busy("preview"))
+            return first_audio[0]
+
+        for streaming in (False, True):
+            window.streaming_cb.setChecked(streaming)
+            times = []
+            for _ in range(repeat):
+                cold_cache()
+                started = time.perf_counter()
+                times.append((preview() - started) * 1000)
+            self.record(f"time_to_first_audio_{'streaming' if streaming else 'full'}", statistics.median(times))
+        window.player.play = play
+        window.player.stop()
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """Print the comparison; returns the names of regressed benchmarks."""
+    regressions = []
+    for name, value in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:32s} no baseline")
+            continue
+        ratio = value / reference if reference else float("inf")
+        regressed = value > reference * (1 + tolerance) and value - reference > min_delta
+        print(f"{name:32s} {value:10.3f} ms vs {reference:10.3f} ms ({ratio:5.2f}x){'  REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark blending, normalization, config I/O, reflow, startup and preview latency.")
+    parser.add_argument("--real", action="store_true", help="Use the real kokoro_onnx model instead of the stub")
+    parser.add_argument("--model", default=core.DEFAULT_MODEL_PATH, help="Path to kokoro.onnx (with --real)")
+    parser.add_argument("--voices", default=core.DEFAULT_VOICES_PATH, help="Path to voices-v1.0.bin (with --real)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub inference time per call in seconds")
+    parser.add_argument("--seconds-per-char", type=float, default=0.0005, help="Stub inference time per character in seconds")
+    parser.add_argument("--repeat", type=int, default=15, help="Rounds per benchmark; the median is reported")
+    parser.add_argument("--baseline", help="Baseline file (default: benchmarks/baseline_<backend>.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown before a benchmark fails (0.5 = 50%%)")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="Ignore slowdowns smaller than this many milliseconds")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    backend = "real" if args.real else "stub"
+    baseline_path = args.baseline or os.path.join(BENCHMARK_DIR, f"baseline_{backend}.json")
+
+    with tempfile.TemporaryDirectory(prefix="kokoro-bench-") as work_dir:
+        if args.real:
+            missing = [path for path in (args.model, args.voices) if not os.path.exists(path)]
+            if missing:
+                print(f"Model files not found: {', '.join(missing)}")
+                return 2
+        else:
+            args.model = os.path.join(work_dir, "kokoro.onnx")
+            args.voices = kokoro_blender_stub.write_voices(os.path.join(work_dir, "voices.npz"))
+            kokoro_blender_stub.install(latency=args.latency, seconds_per_char=args.seconds_per_char)
+        results = Bench(args, work_dir).run()
+
+    if args.update_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "backend": backend,
+                "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs, Python {platform.python_version()}",
+                "results": results,
+            }, f, indent=4)
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; run with --update-baseline first.")
+        return 0
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    print()
+    regressions = compare(results, baseline, args.tolerance, args.min_delta)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        return 1
+    print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
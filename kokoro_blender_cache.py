@@ -0,0 +1,161 @@
+"""LRU cache of synthesized audio keyed on text, blend, speed and language."""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def normalize_text(text):
+    """Collapse whitespace so reflowed but otherwise identical texts share entries."""
+    return " ".join(text.split())
+
+
+def make_key(text, slider_values, normalize, speed, lang="en-us", variant="fp32", model=None):
+    """Build a cache key.
+
+    slider_values maps each voice to its integer slider value (0-100), which
+    quantizes the blend to the resolution the user can actually set. variant
+    is the model variant that renders, since e.g. int8 output differs from fp32.
+    model identifies the files behind it, e.g. (model path, voices checksum):
+    the disk tier outlives both, so a replaced voices pack or a variant
+    pointed at another model file must not hit audio rendered by the old one.
+    """
+    weights = tuple(sorted((voice, int(value)) for voice, value in slider_values.items() if value > 0))
+    return (normalize_text(text), weights, bool(normalize), round(float(speed), 2), lang, variant, model)
+
+
+class SynthesisCache:
+    """Thread-safe LRU of (samples, sr) results with a byte budget.
+
+    With disk_dir set, every stored result is also written there and memory
+    misses fall back to it, so renders survive a restart. The disk tier is
+    trimmed to max_disk_bytes, oldest files first.
+    """
+    def __init__(self, max_bytes=256 * 1024 * 1024, disk_dir=None, max_disk_bytes=1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.entries = OrderedDict()  # key -> (samples, sr)
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_bytes = None  # Size of the disk tier, counted on the first write
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return (samples, sr) for key or None."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        entry = self._load_from_disk(key)
+        with self.lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, *entry)
+            return entry
+
+    def put(self, key, samples, sr):
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        samples.setflags(write=False)  # Shared with every later hit
+        with self.lock:
+            self._store(key, samples, sr)
+        self._save_to_disk(key, samples, sr)
+
+    def _store(self, key, samples, sr):
+        if samples.nbytes > self.max_bytes:
+            return
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size -= previous[0].nbytes
+        self.entries[key] = (samples, sr)
+        self.size += samples.nbytes
+        while self.size > self.max_bytes:
+            _, (evicted, _) = self.entries.popitem(last=False)
+            self.size -= evicted.nbytes
+            self.evictions += 1
+
+    def _disk_path(self, key):
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.npz")
+
+    def _load_from_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with np.load(path) as data:
+                samples, sr = data["samples"], int(data["sr"])
+            os.utime(path)  # Keep recently used files out of the trim
+        except (OSError, KeyError, ValueError):
+            return None
+        samples.setflags(write=False)
+        return samples, sr
+
+    def _save_to_disk(self, key, samples, sr):
+        if not self.disk_dir:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            path = self._disk_path(key)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                np.savez(f, samples=samples, sr=sr)
+            size = os.path.getsize(temp_path)
+            try:
+                size -= os.path.getsize(path)  # Replacing an entry
+            except OSError:
+                pass
+            os.replace(temp_path, path)
+            # The directory is only scanned on the first write and when it is over budget
+            with self.lock:
+                if self.disk_bytes is not None:
+                    self.disk_bytes += size
+                scan = self.disk_bytes is None or self.disk_bytes > self.max_disk_bytes
+            if scan:
+                self._trim_disk()
+        except OSError as e:
+            print(f"Failed to write synthesis cache: {str(e)}")
+
+    def _trim_disk(self):
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".npz"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        with self.lock:
+            self.disk_bytes = total
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.size,
+            }
@@ -0,0 +1,196 @@
+"""Headless batch rendering of blender configs without the GUI.
+
+Renders every config x text combination to an audio file, spreading the work
+across a process pool with one ONNX session per worker:
+
+    python kokoro_blender_cli.py --config my_mix other_mix.json \
+        --text-file intro.txt outro.txt --output-dir renders --workers 4
+
+Configs are the JSON files written by "Save Config" (voice_weights,
+normalize_sliders, speed), given as paths or as names in the config directory.
+A config saved with its blend (<config>.blend.npz) is rendered without blending.
+
+--export-voices adds the blend of every config, named after it, to a voices
+pack that kokoro_onnx loads like voices-v1.0.bin:
+
+    python kokoro_blender_cli.py --config my_mix other_mix --export-voices voices-custom.bin
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from kokoro_blender_core import (
+    DEFAULT_CONFIG_DIR, DEFAULT_MODEL_PATH, DEFAULT_VOICES_PATH, MODEL_VARIANTS, MODEL_VARIANTS_FILE,
+    SESSION_SETTINGS_FILE, ModelVariants, PhonemeCache, VoiceBlender, VoiceStore, config_weights, export_voices,
+    file_checksum, load_pipeline, read_blend_sidecar, read_config, read_session_settings, resident_memory_mb,
+    resolve_config_path
+)
+
+# Per-process state, set up once by init_worker
+_pipeline = None
+_blender = None
+_phoneme_cache = None
+_voices_checksum = None
+
+
+def init_worker(model_path, voices_path, voice_store_dir, intra_op_threads, session_settings, voices_checksum):
+    global _pipeline, _blender, _phoneme_cache, _voices_checksum
+    _pipeline = load_pipeline(model_path, voices_path, intra_op_threads, session_settings)
+    _voices_checksum = voices_checksum
+    # All workers map the same read-only voice stack, so its pages are shared
+    voice_store = VoiceStore(voices_path, voice_store_dir)
+    _blender = VoiceBlender(voice_store.names, voice_store)
+    _phoneme_cache = PhonemeCache(_pipeline.tokenizer.phonemize)
+
+
+def render_job(config_path, text, output_path, lang):
+    """Render one config x text job.
+
+    Returns (output_path, audio_seconds, render_seconds, worker_rss_mb).
+    """
+    import soundfile as sf
+
+    started = time.perf_counter()
+    config = read_config(config_path)
+    voice_blend = config_blend(config_path, config, _blender, _voices_checksum)
+    phonemes = _phoneme_cache.phonemes(text, lang)
+    samples, sr = _pipeline.create(phonemes, voice=voice_blend, speed=config.get("speed", 1.0), lang=lang, is_phonemes=True)
+    sf.write(output_path, samples, sr)
+    return output_path, len(samples) / sr, time.perf_counter() - started, resident_memory_mb()
+
+
+def config_blend(config_path, config, blender, voices_checksum):
+    """Style vector of a config, from its blend sidecar when that is still valid."""
+    voice_blend = read_blend_sidecar(config_path, config, voices_checksum)
+    if voice_blend is None:
+        voice_blend = blender.blend(config_weights(config, blender))
+    return voice_blend
+
+
+def export_config_voices(config_paths, pack_path, voices_path, voice_store_dir):
+    """Add the blend of every config to the voices pack, named after the config file."""
+    voice_store = VoiceStore(voices_path, voice_store_dir)
+    blender = VoiceBlender(voice_store.names, voice_store)
+    checksum = file_checksum(voices_path)
+    styles = {}
+    for config_path in config_paths:
+        name = os.path.splitext(os.path.basename(config_path))[0]
+        styles[name] = config_blend(config_path, read_config(config_path), blender, checksum)
+    names = export_voices(pack_path, styles)
+    print(f"Exported {', '.join(sorted(styles))} to {pack_path} ({len(names)} voices)")
+
+
+def output_name(config_path, text_name, extension):
+    """Deterministic file name for a config x text pair."""
+    config_name = os.path.splitext(os.path.basename(config_path))[0]
+    return f"{config_name}__{text_name}.{extension}"
+
+
+def collect_texts(args):
+    """(name, text) pairs from --text and --text-file."""
+    texts = [(f"text{index:03d}", text) for index, text in enumerate(args.text or [], start=1)]
+    for path in args.text_file or []:
+        with open(path, "r", encoding="utf-8") as f:
+            texts.append((os.path.splitext(os.path.basename(path))[0], f.read().strip()))
+    return texts
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Render Kokoro voice blender configs to audio files without the GUI.")
+    parser.add_argument("--config", nargs="+", required=True, help="Config files or names in --config-dir")
+    parser.add_argument("--text", nargs="+", help="Texts to synthesize")
+    parser.add_argument("--text-file", nargs="+", help="Text files to synthesize")
+    parser.add_argument("--output-dir", default="renders", help="Directory for the rendered files")
+    parser.add_argument("--format", default="wav", choices=["wav", "flac", "ogg"], help="Output file format")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--lang", default="en-us", help="Language passed to the phonemizer")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Path to kokoro.onnx")
+    parser.add_argument("--variant", choices=MODEL_VARIANTS, help="Model variant registered in the GUI, instead of --model")
+    parser.add_argument("--voices", default=DEFAULT_VOICES_PATH, help="Path to voices-v1.0.bin")
+    parser.add_argument("--config-dir", default=DEFAULT_CONFIG_DIR, help="Directory searched for config names")
+    parser.add_argument("--voice-store-dir", help="Directory for the memory-mapped voice stack (default: <config-dir>/cache/voices)")
+    parser.add_argument("--export-voices", metavar="PACK", help="Add the configs' blends to this voices pack instead of rendering")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    texts = collect_texts(args)
+    if not texts and not args.export_voices:
+        print("Nothing to render: pass --text or --text-file.")
+        return 2
+
+    config_paths = [resolve_config_path(name, args.config_dir) for name in args.config]
+    missing = [path for path in config_paths if not os.path.exists(path)]
+    if missing:
+        print(f"Config not found: {', '.join(missing)}")
+        return 2
+
+    voice_store_dir = args.voice_store_dir or os.path.join(args.config_dir, "cache", "voices")
+    if args.export_voices:
+        try:
+            export_config_voices(config_paths, args.export_voices, args.voices, voice_store_dir)
+        except ValueError as e:
+            print(str(e))
+            return 2
+        return 0
+
+    if args.variant:
+        variants = ModelVariants(os.path.join(args.config_dir, MODEL_VARIANTS_FILE), args.model)
+        if args.variant not in variants.paths:
+            print(f"Model variant {args.variant} is not registered in {variants.path}")
+            return 2
+        args.model = variants.paths[args.variant]
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    # Convert the voice pack once up front instead of racing in every worker
+    VoiceStore(args.voices, voice_store_dir)
+    jobs = [
+        (config_path, text, os.path.join(args.output_dir, output_name(config_path, text_name, args.format)))
+        for config_path in config_paths
+        for text_name, text in texts
+    ]
+
+    # Split the cores between the workers instead of letting every session grab all of them;
+    # the other session settings are the ones saved from the GUI
+    workers = max(1, min(args.workers, len(jobs)))
+    intra_op_threads = max(1, (os.cpu_count() or 1) // workers)
+    session_settings = read_session_settings(os.path.join(args.config_dir, SESSION_SETTINGS_FILE))
+
+    started = time.perf_counter()
+    audio_seconds = 0.0
+    failures = 0
+    worker_rss = 0.0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(args.model, args.voices, voice_store_dir, intra_op_threads, session_settings, file_checksum(args.voices))
+    ) as pool:
+        futures = {pool.submit(render_job, config_path, text, output_path, args.lang): output_path
+                   for config_path, text, output_path in jobs}
+        for future in as_completed(futures):
+            try:
+                output_path, seconds, render_seconds, rss = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"FAILED {futures[future]}: {str(e)}")
+                continue
+            audio_seconds += seconds
+            worker_rss = max(worker_rss, rss)
+            print(f"{output_path}: {seconds:.2f}s audio in {render_seconds:.2f}s")
+
+    elapsed = time.perf_counter() - started
+    rendered = len(jobs) - failures
+    print(
+        f"Rendered {rendered}/{len(jobs)} files, {audio_seconds:.1f}s of audio in {elapsed:.1f}s "
+        f"with {workers} workers: {rendered / elapsed:.2f} files/s, "
+        f"real-time factor {elapsed / audio_seconds if audio_seconds else 0:.3f}, "
+        f"peak worker resident memory {worker_rss:.0f} MB"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
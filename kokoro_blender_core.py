@@ -0,0 +1,958 @@
+"""Qt-free helpers shared by the Kokoro Voice Blender GUI and headless tools."""
+import hashlib
+import json
+import logging
+import os
+import re
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+import numpy as np
+
+# Default locations, shared with kokoro-tts-gui
+DEFAULT_MODEL_PATH = "/home/pg/Dokumente/Kokoro-82M/kokoro.onnx"
+DEFAULT_VOICES_PATH = "/home/pg/Dokumente/Kokoro-82M/voices-v1.0.bin"
+DEFAULT_CONFIG_DIR = "/home/pg/Dokumente/Kokoro-82M/configs"
+
+# Available voices
+VOICES = [
+    "af_alloy", "af_aoede", "af_bella", "af_heart", "af_jessica", "af_kore", "af_nicole", "af_nova", "af_river", "af_sarah", "af_sky",
+    "am_adam", "am_echo", "am_eric", "am_fenrir", "am_liam", "am_michael", "am_onyx", "am_puck", "am_santa",
+    "bf_alice", "bf_emma", "bf_isabella", "bf_lily",
+    "bm_daniel", "bm_fable", "bm_george", "bm_lewis",
+    "ef_dora", "em_alex", "em_santa",
+    "ff_siwis",
+    "hf_alpha", "hf_beta", "hm_omega", "hm_psi",
+    "if_sara", "im_nicola",
+    "jf_alpha", "jf_gongitsune", "jf_nezumi", "jf_tebukuro", "jm_kumo",
+    "pf_dora", "pm_alex", "pm_santa",
+    "zf_xiaobei", "zf_xiaoni", "zf_xiaoxiao", "zf_xiaoyi",
+    "zm_yunjian", "zm_yunxia", "zm_yunxi", "zm_yunyang"
+]
+
+# Pause inserted between sentences when they are synthesized one by one
+SENTENCE_PAUSE = 0.25
+
+# Sentence ends (punctuation followed by whitespace) and blank-line paragraph breaks
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])\s+|\n\s*\n")
+_PARAGRAPH_BOUNDARY = re.compile(r"\n\s*\n")
+
+
+def split_sentences(text):
+    """Split text into sentences and paragraphs, dropping empty pieces."""
+    return [piece.strip() for piece in _SENTENCE_BOUNDARY.split(text) if piece.strip()]
+
+
+def split_long_text(text, max_chars=400):
+    """Group sentences into chunks of up to max_chars that never span a paragraph break.
+
+    A single sentence longer than max_chars becomes a chunk of its own.
+    """
+    chunks = []
+    for paragraph in _PARAGRAPH_BOUNDARY.split(text):
+        current = ""
+        for sentence in split_sentences(paragraph):
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+def render_chunks(synthesize, chunks, workers=2, on_chunk=None):
+    """Render chunks in parallel and return their (samples, sr) results in order.
+
+    synthesize(chunk) runs on a thread pool (ONNX Runtime releases the GIL
+    during inference). on_chunk(done, total) is called as chunks complete;
+    returning False cancels the chunks not started yet and makes this return None.
+    """
+    results = [None] * len(chunks)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(synthesize, chunk): index for index, chunk in enumerate(chunks)}
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                results[futures[future]] = future.result()
+                if on_chunk is not None and on_chunk(done, len(chunks)) is False:
+                    return None
+        finally:
+            for future in futures:
+                future.cancel()
+    return results
+
+
+def iter_chunks(synthesize, chunks, workers=2):
+    """Render chunks in parallel and yield their (samples, sr) results in order.
+
+    Unlike render_chunks, only 2 * workers chunks are submitted or held ahead
+    of the one being consumed, so memory stays flat however long the text is.
+    Closing the generator cancels the chunks not started yet.
+    """
+    ahead = max(1, workers) * 2
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        try:
+            for index, chunk in enumerate(chunks):
+                pending.append(pool.submit(synthesize, chunk))
+                if index >= ahead - 1:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def join_audio(parts, sr, gap=0.0, crossfade=0.0):
+    """Concatenate sample arrays with gap seconds of silence, or crossfade seconds of overlap."""
+    if crossfade > 0:
+        fade = int(crossfade * sr)
+        result = np.asarray(parts[0], dtype=np.float32)
+        for part in parts[1:]:
+            part = np.asarray(part, dtype=np.float32)
+            overlap = min(fade, len(result), len(part))
+            ramp = np.linspace(0.0, 1.0, overlap, dtype=np.float32)
+            mixed = result[len(result) - overlap:] * (1 - ramp) + part[:overlap] * ramp
+            result = np.concatenate([result[:len(result) - overlap], mixed, part[overlap:]])
+        return result
+    silence = np.zeros(int(gap * sr), dtype=np.float32)
+    pieces = []
+    for index, part in enumerate(parts):
+        if index:
+            pieces.append(silence)
+        pieces.append(np.asarray(part, dtype=np.float32))
+    return np.concatenate(pieces)
+
+
+# Output formats by file extension: soundfile format and subtype
+AUDIO_FORMATS = {".wav": ("WAV", "PCM_16"), ".flac": ("FLAC", "PCM_16"), ".ogg": ("OGG", "VORBIS")}
+
+
+class StreamingAudioWriter:
+    """Writes audio to a WAV, FLAC or OGG file part by part, joined like join_audio.
+
+    Only the crossfade tail of the last part is held back, so memory does not
+    grow with the length of the render. Parts go to a temporary file that
+    replaces path on close(); abort(), or leaving a with block on an
+    exception, removes it and leaves path untouched.
+    """
+    def __init__(self, path, sr, gap=0.0, crossfade=0.0):
+        import soundfile as sf
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in AUDIO_FORMATS:
+            raise ValueError(f"Unsupported output format {extension or path}; use {', '.join(AUDIO_FORMATS)}")
+        audio_format, subtype = AUDIO_FORMATS[extension]
+        self.path = path
+        self.sr = sr
+        self.gap = np.zeros(int(gap * sr), dtype=np.float32)
+        self.fade = int(crossfade * sr)
+        self.tail = None  # Last samples written, held back for the crossfade
+        self.parts = 0
+        self.frames = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.temp_path = f"{path}.{os.getpid()}.tmp"
+        self.file = sf.SoundFile(self.temp_path, "w", samplerate=sr, channels=1, format=audio_format, subtype=subtype)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, samples):
+        samples = np.asarray(samples, dtype=np.float32)
+        if self.fade > 0:
+            if self.tail is not None:
+                overlap = min(self.fade, len(self.tail), len(samples))
+                ramp = np.linspace(0.0, 1.0, overlap, dtype=np.float32)
+                mixed = self.tail[len(self.tail) - overlap:] * (1 - ramp) + samples[:overlap] * ramp
+                samples = np.concatenate([self.tail[:len(self.tail) - overlap], mixed, samples[overlap:]])
+            keep = min(self.fade, len(samples))
+            self.tail = samples[len(samples) - keep:]
+            samples = samples[:len(samples) - keep]
+        elif self.parts:
+            self.put(self.gap)
+        self.parts += 1
+        self.put(samples)
+
+    def put(self, samples):
+        self.file.write(samples)
+        self.frames += len(samples)
+
+    def close(self):
+        """Finish the file and move it into place; returns the seconds of audio written."""
+        if self.fade > 0 and self.tail is not None:
+            self.put(self.tail)
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+        return self.frames / self.sr
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+class PhonemeCache:
+    """Phonemizes text one sentence at a time, remembering each (sentence, lang).
+
+    Slider changes then only pay for inference, and edits to a long text only
+    re-phonemize the sentences that changed. A different language is a
+    different key, so switching it never reuses stale phonemes.
+    """
+    def __init__(self, phonemize, max_entries=4096):
+        self.phonemize = phonemize  # callable(text, lang) -> phoneme string
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def sentence_phonemes(self, sentence, lang):
+        key = (sentence, lang)
+        with self.lock:
+            phonemes = self.entries.get(key)
+            if phonemes is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return phonemes
+            self.misses += 1
+        phonemes = self.phonemize(sentence, lang)
+        with self.lock:
+            self.entries[key] = phonemes
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return phonemes
+
+    def phonemes(self, text, lang="en-us"):
+        """Phonemes for the whole text, joined sentence by sentence."""
+        return " ".join(self.sentence_phonemes(sentence, lang) for sentence in split_sentences(text))
+
+
+def scale_weights(slider_values, normalize):
+    """Turn integer slider values (0-100) into blend weights.
+
+    Works on the last axis, so a 2-D array scales many weight vectors at once.
+    With normalization the sliders already sum to 1 and are used as they are;
+    without it the raw weights are scaled to sum to 1 to keep full intensity.
+    """
+    weights = np.asarray(slider_values, dtype=np.float32) / 100
+    if not normalize:
+        totals = weights.sum(axis=-1, keepdims=True)
+        weights = np.divide(weights, totals, out=np.zeros_like(weights), where=totals > 0)
+    return weights
+
+
+def apportion(weights, total):
+    """Integer shares of `total` proportional to weights that sum to exactly `total`.
+
+    Uses the largest remainder method, so each share is its exact value
+    rounded down or up.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    weight_sum = weights.sum()
+    if weight_sum <= 0 or total <= 0:
+        return np.zeros(len(weights), dtype=int)
+    exact = weights * (total / weight_sum)
+    shares = np.floor(exact).astype(int)
+    shortfall = int(total - shares.sum())
+    if shortfall > 0:
+        shares[np.argsort(shares - exact, kind="stable")[:shortfall]] += 1
+    return shares
+
+
+def normalize_percent(values):
+    """Rescale integer slider values (0-100) to sum to exactly 100, as "Normalize Sliders" does."""
+    values = np.asarray(values, dtype=int)
+    if not values.any():
+        return values.copy()
+    return apportion(values, 100)
+
+
+class WeightModel:
+    """Slider state as one integer vector (percent per voice, 0-100).
+
+    The mutating methods return the indices whose value actually changed, so
+    the view only has to update those widgets.
+    """
+    def __init__(self, n_voices):
+        self.values = np.zeros(n_voices, dtype=int)
+
+    def assign(self, values):
+        """Replace all values."""
+        new_values = np.clip(np.asarray(values, dtype=int), 0, 100)
+        changed = np.flatnonzero(new_values != self.values)
+        self.values = new_values
+        return changed
+
+    def normalize(self):
+        """Scale all values to sum to 100."""
+        return self.assign(normalize_percent(self.values))
+
+    def rebalance(self, index):
+        """Keep the value at index and share the rest of 100 among the other active voices.
+
+        The other voices keep their proportions. When no other voice is active
+        the value is left as it is.
+        """
+        others = self.values.copy()
+        others[index] = 0
+        if not others.any():
+            return np.array([], dtype=int)
+        new_values = apportion(others, 100 - self.values[index])
+        new_values[index] = self.values[index]
+        return self.assign(new_values)
+
+    def active(self):
+        return np.flatnonzero(self.values)
+
+
+def draw_random_values(n_voices, count=None, active=None, normalize=True):
+    """Integer slider values (0-100) for a random blend over n_voices.
+
+    Picks `count` random voices (Randomize) or re-weights the `active` voice
+    indices (Refresh). Weights are drawn from a Dirichlet distribution when
+    normalizing and uniformly from 0.01-1.00 otherwise.
+    """
+    if active is None:
+        chosen = np.random.choice(n_voices, min(count, n_voices), replace=False)
+    else:
+        chosen = np.asarray(active)
+    if normalize:
+        weights = np.random.dirichlet(np.ones(len(chosen)))
+    else:
+        weights = np.random.uniform(0.01, 1.00, len(chosen))
+    values = np.zeros(n_voices, dtype=int)
+    values[chosen] = np.clip(np.round(weights * 100), 1, 100)
+    return normalize_percent(values) if normalize else values
+
+
+def resident_memory_mb():
+    """Resident set size of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class StageTimer:
+    """Milliseconds spent per named stage of one render.
+
+    Stages timed on several threads (parallel chunks) add up, so their sum can
+    exceed the wall-clock total.
+    """
+    def __init__(self, kind):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - started) * 1000)
+
+    def add(self, name, milliseconds):
+        with self.lock:
+            self.stages[name] = self.stages.get(name, 0.0) + milliseconds
+
+    def record(self, audio_seconds=None, **extra):
+        """JSON-ready summary: stages, total, audio length and real-time factor."""
+        total_ms = (time.perf_counter() - self.started) * 1000
+        with self.lock:
+            stages = {name: round(ms, 2) for name, ms in self.stages.items()}
+        record = {
+            "timestamp": time.time(),
+            "host": socket.gethostname(),
+            "kind": self.kind,
+            "total_ms": round(total_ms, 1),
+            "stages_ms": stages,
+        }
+        if audio_seconds:
+            record["audio_s"] = round(audio_seconds, 3)
+            record["rtf"] = round(total_ms / 1000 / audio_seconds, 3)
+        record.update(extra)
+        return record
+
+
+def open_timing_log(path, max_bytes=1024 * 1024, backups=5):
+    """Logger writing one JSON record per line to path, rotated at max_bytes."""
+    logger = logging.getLogger(f"kokoro_blender.timings.{os.path.abspath(path)}")
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def profile_job(fn, path):
+    """Wrap a worker job so it runs under cProfile; stats go to path and the top entries to stdout."""
+    def job(*args, **kwargs):
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            profiler.dump_stats(path)
+            print(f"Profile written to {path}")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+    return job
+
+
+class VoiceStore:
+    """Read-only voice pack memory-mapped from an uncompressed .npy stack.
+
+    The voices file (an .npz archive such as voices-v1.0.bin) is converted
+    once into store_dir as one (n_voices, ...) float32 array plus a list of
+    names; the file name encodes the source size and mtime, so a changed pack
+    is converted again. Pages are only read for the voices a blend touches, and
+    processes mapping the same file share them.
+    """
+    def __init__(self, voices_path, store_dir):
+        stat = os.stat(voices_path)
+        stem = f"{os.path.splitext(os.path.basename(voices_path))[0]}-{stat.st_size}-{int(stat.st_mtime)}"
+        matrix_path = os.path.join(store_dir, f"{stem}.npy")
+        names_path = os.path.join(store_dir, f"{stem}.json")
+        if not (os.path.exists(matrix_path) and os.path.exists(names_path)):
+            self.convert(voices_path, matrix_path, names_path)
+        with open(names_path, "r", encoding="utf-8") as f:
+            self.names = json.load(f)
+        self.matrix = np.load(matrix_path, mmap_mode="r")
+        self.index = {voice: i for i, voice in enumerate(self.names)}
+
+    @staticmethod
+    def convert(voices_path, matrix_path, names_path):
+        """Write the voices of an .npz pack into one .npy stack, a voice at a time."""
+        os.makedirs(os.path.dirname(matrix_path), exist_ok=True)
+        temp_suffix = f".{os.getpid()}.tmp"
+        with np.load(voices_path) as pack:
+            names = sorted(pack.files)
+            first = pack[names[0]]
+            matrix = np.lib.format.open_memmap(
+                matrix_path + temp_suffix, mode="w+", dtype=np.float32, shape=(len(names),) + first.shape
+            )
+            for i, voice in enumerate(names):
+                matrix[i] = pack[voice]
+            matrix.flush()
+            del matrix
+        with open(names_path + temp_suffix, "w", encoding="utf-8") as f:
+            json.dump(names, f)
+        os.replace(matrix_path + temp_suffix, matrix_path)
+        os.replace(names_path + temp_suffix, names_path)
+
+    def __contains__(self, voice):
+        return voice in self.index
+
+    def __getitem__(self, voice):
+        return self.matrix[self.index[voice]]
+
+    def keys(self):
+        return list(self.names)
+
+
+class VoiceBlender:
+    """Blends voice styles from one contiguous (n_voices, ...) float32 matrix.
+
+    Voices missing from the voice store are left out once at load time and
+    listed in `missing`; `names` holds the voices that can be blended. With a
+    VoiceStore the memory-mapped matrix is used in place and a blend only
+    reads the rows of voices with a non-zero weight; any other mapping of
+    voice arrays is stacked into memory.
+    """
+    def __init__(self, voices, voice_store):
+        self.missing = [voice for voice in voices if voice not in voice_store]
+        self.names = [voice for voice in voices if voice in voice_store]
+        self.index = {voice: i for i, voice in enumerate(self.names)}
+        if isinstance(voice_store, VoiceStore):
+            self.matrix = voice_store.matrix
+            self.rows = np.array([voice_store.index[voice] for voice in self.names], dtype=np.intp)
+        else:
+            self.matrix = np.stack([np.asarray(voice_store[voice], dtype=np.float32) for voice in self.names])
+            self.rows = np.arange(len(self.names))
+
+    def weight_vector(self, voice_values):
+        """Map {voice: value} onto a vector aligned with `names`."""
+        vector = np.zeros(len(self.names), dtype=np.float32)
+        for voice, value in voice_values.items():
+            i = self.index.get(voice)
+            if i is not None:
+                vector[i] = value
+        return vector
+
+    def blend(self, weights):
+        """Style vector for one weight vector aligned with `names`."""
+        weights = np.asarray(weights, dtype=np.float32)
+        active = np.flatnonzero(weights)
+        return np.tensordot(weights[active], self.matrix[self.rows[active]], axes=1)
+
+    def blend_batch(self, weights):
+        """Style vectors for a (k, n_voices) weight matrix, shape (k, ...)."""
+        weights = np.asarray(weights, dtype=np.float32)
+        active = np.flatnonzero(weights.any(axis=0))
+        return np.tensordot(weights[:, active], self.matrix[self.rows[active]], axes=(1, 0))
+
+
+# ONNX Runtime session settings, stored as JSON next to the blender configs
+SESSION_SETTINGS_FILE = "session_settings.json"
+SESSION_DEFAULTS = {
+    "intra_op_threads": 0,  # 0 lets ONNX Runtime choose
+    "inter_op_threads": 0,
+    "execution_mode": "sequential",
+    "graph_optimization": "all",
+    "optimized_model_path": "",
+}
+EXECUTION_MODES = ("sequential", "parallel")
+GRAPH_OPTIMIZATIONS = ("disabled", "basic", "extended", "all")
+WARM_UP_TEXT = "Warming up the voice blender."
+
+
+def read_session_settings(path):
+    """Session settings from path, with defaults for anything missing or unreadable."""
+    settings = dict(SESSION_DEFAULTS)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        settings.update({name: value for name, value in stored.items() if name in SESSION_DEFAULTS})
+    except (OSError, ValueError, AttributeError):
+        pass
+    return settings
+
+
+def write_session_settings(path, settings):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({name: settings[name] for name in SESSION_DEFAULTS}, f, indent=4)
+
+
+def session_options(settings):
+    import onnxruntime as ort
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = int(settings["intra_op_threads"])
+    options.inter_op_num_threads = int(settings["inter_op_threads"])
+    options.execution_mode = {
+        "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+        "parallel": ort.ExecutionMode.ORT_PARALLEL,
+    }[settings["execution_mode"]]
+    options.graph_optimization_level = {
+        "disabled": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    }[settings["graph_optimization"]]
+    return options
+
+
+def load_pipeline(model_path, voices_path, intra_op_threads=None, settings=None):
+    """Create a kokoro_onnx.Kokoro pipeline with the given session settings.
+
+    intra_op_threads overrides the setting of the same name. With an
+    optimized_model_path the optimized graph is saved on the first load and
+    reused by later ones until the model file changes. kokoro_onnx is
+    imported here so importing this module stays cheap.
+    """
+    import kokoro_onnx
+    settings = dict(settings or SESSION_DEFAULTS)
+    if intra_op_threads is not None:
+        settings["intra_op_threads"] = intra_op_threads
+    if settings == SESSION_DEFAULTS:
+        return kokoro_onnx.Kokoro(model_path=model_path, voices_path=voices_path)
+    import onnxruntime as ort
+    options = session_options(settings)
+    optimized_path = settings["optimized_model_path"]
+    if optimized_path and os.path.exists(optimized_path) and os.path.getmtime(optimized_path) >= os.path.getmtime(model_path):
+        model_path = optimized_path
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    elif optimized_path:
+        os.makedirs(os.path.dirname(optimized_path) or ".", exist_ok=True)
+        options.optimized_model_filepath = optimized_path
+    session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+    return kokoro_onnx.Kokoro.from_session(session, voices_path)
+
+
+def thread_candidates(cpu_count=None):
+    """Intra-op thread counts worth trying: 1, powers of two and all cores."""
+    cpus = cpu_count or os.cpu_count() or 1
+    counts = {1, cpus}
+    count = 2
+    while count < cpus:
+        counts.add(count)
+        count *= 2
+    return sorted(counts)
+
+
+def sweep_thread_counts(model_path, voices_path, settings, voice, phonemes, candidates=None, repeats=3, on_result=None):
+    """Time a short render with every candidate intra-op thread count.
+
+    Each count gets its own session and one untimed warm-up render. Returns
+    {threads: median milliseconds}, fastest first; on_result(threads, ms) is
+    called as each count finishes and stops the sweep by returning False.
+    """
+    results = {}
+    for threads in candidates or thread_candidates():
+        pipeline = load_pipeline(model_path, voices_path, threads, dict(settings, optimized_model_path=""))
+        pipeline.create(phonemes, voice=voice, is_phonemes=True)
+        times = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            pipeline.create(phonemes, voice=voice, is_phonemes=True)
+            times.append((time.perf_counter() - started) * 1000)
+        results[threads] = sorted(times)[len(times) // 2]
+        if on_result is not None and on_result(threads, results[threads]) is False:
+            break
+    return dict(sorted(results.items(), key=lambda item: item[1]))
+
+
+# Model variants: fp32 is the original kokoro.onnx, the others trade quality for CPU speed
+MODEL_VARIANTS = ("fp32", "fp16", "int8")
+MODEL_VARIANTS_FILE = "model_variants.json"
+
+
+class ModelVariants:
+    """Model file per variant and the variant used for previews and for saving, stored as JSON."""
+    def __init__(self, path, default_model_path):
+        self.path = path
+        self.paths = {"fp32": default_model_path}
+        self.roles = {"preview": "fp32", "save": "fp32"}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            self.paths.update({name: model for name, model in stored.get("paths", {}).items() if name in MODEL_VARIANTS and model})
+            self.roles.update({role: name for role, name in stored.get("roles", {}).items() if role in self.roles and name in self.paths})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def model_path(self, role):
+        return self.paths[self.roles[role]]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"paths": self.paths, "roles": self.roles}, f, indent=4)
+
+
+def quantize_model(model_path, output_path):
+    """Write a dynamically quantized (int8 weights) copy of an ONNX model.
+
+    Needs the onnx package next to onnxruntime.
+    """
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as e:
+        raise RuntimeError(f"{str(e)}. Quantization needs the 'onnx' package: pip install onnx")
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    temp_path = f"{output_path}.tmp"
+    quantize_dynamic(model_path, temp_path, weight_type=QuantType.QUInt8)
+    os.replace(temp_path, output_path)
+    return output_path
+
+
+def waveform_difference(reference, candidate, sr):
+    """How far candidate is from reference: SNR in dB, correlation and length difference.
+
+    Compared sample by sample over the shorter length, so variants whose
+    predicted durations drift apart score low even when both sound fine.
+    """
+    length = min(len(reference), len(candidate))
+    reference = np.asarray(reference[:length], dtype=np.float64)
+    candidate = np.asarray(candidate[:length], dtype=np.float64)
+    noise = np.sum((reference - candidate) ** 2)
+    signal = np.sum(reference ** 2)
+    snr_db = 10 * np.log10(signal / noise) if noise > 0 and signal > 0 else float("inf")
+    correlation = float(np.corrcoef(reference, candidate)[0, 1]) if length > 1 and reference.std() and candidate.std() else 1.0
+    return {
+        "snr_db": round(float(snr_db), 2),
+        "correlation": round(correlation, 4),
+        "length_diff_s": round((len(candidate) - len(reference)) / sr if length else 0.0, 3),
+    }
+
+
+def compare_pipelines(pipeline_a, pipeline_b, phonemes, voice, speed=1.0, repeats=3):
+    """A/B render of the same phonemes and voice on two pipelines.
+
+    Returns (report, samples_a, samples_b, sr); the report has the median
+    latency of each side after one untimed warm-up render, B's speedup over A
+    and waveform_difference() of B against A.
+    """
+    report = {}
+    audio = {}
+    for side, pipeline in (("a", pipeline_a), ("b", pipeline_b)):
+        samples, sr = pipeline.create(phonemes, voice=voice, speed=speed, is_phonemes=True)
+        times = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            samples, sr = pipeline.create(phonemes, voice=voice, speed=speed, is_phonemes=True)
+            times.append((time.perf_counter() - started) * 1000)
+        report[f"{side}_ms"] = round(sorted(times)[len(times) // 2], 1)
+        audio[side] = samples
+    report["speedup"] = round(report["a_ms"] / report["b_ms"], 2) if report["b_ms"] else float("inf")
+    report.update(waveform_difference(audio["a"], audio["b"], sr))
+    return report, audio["a"], audio["b"], sr
+
+
+def read_config(path):
+    """Read a blender config (voice_weights, normalize_sliders, speed, ...)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def resolve_config_path(name, config_dir=DEFAULT_CONFIG_DIR):
+    """Accept a path or the name of a config in config_dir, with or without .json."""
+    if os.path.exists(name):
+        return name
+    file_name = name if name.endswith(".json") else f"{name}.json"
+    return os.path.join(config_dir, file_name)
+
+
+def config_weights(config, blender):
+    """Blend weights for a config, aligned with blender.names.
+
+    voice_weights hold slider values divided by 100, the format written by the
+    GUI and kokoro-tts-gui. They go through config_slider_values first, so a
+    normalized config blends exactly as the GUI and the server load it.
+    """
+    values = config_slider_values(config, blender.names)
+    return scale_weights(values, config.get("normalize_sliders", True))
+
+
+# Blended style vectors saved next to their config, and packs of named blends
+BLEND_SIDECAR_SUFFIX = ".blend.npz"
+_VOICE_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+_checksums = {}
+
+
+def file_checksum(path):
+    """SHA-256 of a file, remembered per size and mtime so a voice pack is hashed once per process."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    checksum = _checksums.get(key)
+    if checksum is None:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        checksum = _checksums[key] = digest.hexdigest()
+    return checksum
+
+
+def blend_sidecar_path(config_path):
+    return os.path.splitext(config_path)[0] + BLEND_SIDECAR_SUFFIX
+
+
+def blend_digest(config):
+    """Fingerprint of the parts of a config that determine its blend."""
+    voice_weights = {voice: weight for voice, weight in config.get("voice_weights", {}).items() if weight}
+    blend = {"voice_weights": voice_weights, "normalize_sliders": bool(config.get("normalize_sliders", True))}
+    return hashlib.sha256(json.dumps(blend, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def write_blend_sidecar(config_path, config, style, voices_checksum):
+    """Store the blended style vector of a config next to it as <config>.blend.npz."""
+    path = blend_sidecar_path(config_path)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        np.savez(f, style=np.asarray(style, dtype=np.float32), config_digest=blend_digest(config), voices_sha256=voices_checksum)
+    os.replace(temp_path, path)
+    return path
+
+
+def read_blend_sidecar(config_path, config, voices_checksum):
+    """The stored style vector of a config, or None when it is missing or stale.
+
+    A sidecar is stale once the config's weights or normalization changed or it
+    was blended from a different voices file.
+    """
+    try:
+        with np.load(blend_sidecar_path(config_path)) as data:
+            if str(data["config_digest"]) != blend_digest(config) or str(data["voices_sha256"]) != voices_checksum:
+                return None
+            return data["style"]
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def export_voices(pack_path, styles):
+    """Add named style vectors to a voices pack, replacing voices of the same name.
+
+    The pack has the .npz layout of voices-v1.0.bin, so kokoro_onnx.Kokoro
+    loads it as voices_path and takes the names as voice="name".
+    """
+    invalid = [name for name in styles if not _VOICE_NAME.match(name)]
+    if invalid:
+        raise ValueError(f"Voice names may only contain letters, digits, '_' and '-': {', '.join(invalid)}")
+    voices = {}
+    if os.path.exists(pack_path):
+        with np.load(pack_path) as pack:
+            voices = {name: pack[name] for name in pack.files}
+    voices.update({name: np.asarray(style, dtype=np.float32) for name, style in styles.items()})
+    os.makedirs(os.path.dirname(pack_path) or ".", exist_ok=True)
+    temp_path = f"{pack_path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        np.savez(f, **voices)
+    os.replace(temp_path, pack_path)
+    return sorted(voices)
+
+
+def config_slider_values(config, voices=VOICES):
+    """Integer slider values (0-100) per voice for a config, as the sliders show them after loading."""
+    voice_weights = config.get("voice_weights", {})
+    values = np.clip([round(voice_weights.get(voice, 0) * 100) for voice in voices], 0, 100).astype(int)
+    return normalize_percent(values) if config.get("normalize_sliders", True) else values
+
+
+class ConfigLibrary:
+    """In-memory index of the blender configs in a directory, for instant preset switching.
+
+    refresh() stats the directory and only re-reads files whose size or mtime
+    changed, so it is cheap enough to run on every file-watcher event. Files
+    that are not blender configs (or are still being written) are skipped until
+    they change again. precompute() stores the blended style vector of every
+    preset, keyed on its slider values, so cached_blend() can hand it out
+    without blending when the sliders show a preset.
+    """
+    def __init__(self, config_dir, voices=VOICES, exclude=(), max_blends=128):
+        self.config_dir = config_dir
+        self.voices = list(voices)
+        self.exclude = set(exclude)
+        self.max_blends = max_blends
+        self.presets = {}  # name -> {"path", "stamp", "config", "values", "blend_key"}
+        self.blends = {}  # blend key -> style vector
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def blend_key(values, normalize):
+        return np.asarray(values, dtype=int).tobytes(), bool(normalize)
+
+    def refresh(self):
+        """Re-scan the directory; returns the names that were added, changed or removed."""
+        try:
+            entries = [
+                entry for entry in os.scandir(self.config_dir)
+                if entry.name.endswith(".json") and entry.name not in self.exclude and entry.is_file()
+            ]
+        except OSError:
+            entries = []
+        changed = []
+        seen = set()
+        for entry in entries:
+            name = entry.name[:-len(".json")]
+            seen.add(name)
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            stamp = (stat.st_size, stat.st_mtime_ns)
+            current = self.presets.get(name)
+            if current is not None and current["stamp"] == stamp:
+                continue
+            try:
+                config = read_config(entry.path)
+                values = config_slider_values(config, self.voices)
+            except (OSError, ValueError, TypeError, AttributeError):
+                config = None
+            with self.lock:
+                if config is None or not isinstance(config.get("voice_weights"), dict):
+                    if self.presets.pop(name, None) is not None:
+                        changed.append(name)
+                    continue
+                self.presets[name] = {"path": entry.path, "stamp": stamp, "config": config, "values": values}
+            changed.append(name)
+        with self.lock:
+            for name in [name for name in self.presets if name not in seen]:
+                del self.presets[name]
+                changed.append(name)
+            if changed:
+                # Changed presets have no blend key yet; the next precompute() blends them again
+                in_use = {preset.get("blend_key") for preset in self.presets.values()}
+                self.blends = {key: blend for key, blend in self.blends.items() if key in in_use}
+        return sorted(changed)
+
+    def names(self):
+        with self.lock:
+            return sorted(self.presets, key=str.lower)
+
+    def preset(self, name):
+        with self.lock:
+            return self.presets.get(name)
+
+    def search(self, query):
+        """Preset names matching every whitespace-separated token, by name or by an active voice."""
+        tokens = query.replace(",", " ").lower().split()
+        if not tokens:
+            return self.names()
+        matches = []
+        with self.lock:
+            for name, preset in self.presets.items():
+                words = [name.lower()] + [voice for voice, value in zip(self.voices, preset["values"]) if value]
+                if all(any(token in word for word in words) for token in tokens):
+                    matches.append(name)
+        return sorted(matches, key=str.lower)
+
+    def precompute(self, blender, voices_checksum=None):
+        """Blend every preset that has no style vector yet. Safe to call from worker threads.
+
+        With the checksum of the voices file, a preset's valid .blend.npz
+        sidecar is used instead of blending it.
+        """
+        pending = {}  # blend key -> (preset, weights)
+        with self.lock:
+            for name in sorted(self.presets):
+                preset = self.presets[name]
+                if "blend_key" in preset:
+                    continue
+                normalize = preset["config"].get("normalize_sliders", True)
+                values = blender.weight_vector(dict(zip(self.voices, preset["values"]))).astype(int)
+                preset["blend_key"] = self.blend_key(values, normalize)
+                room = self.max_blends - len(self.blends) - len(pending)
+                if values.any() and preset["blend_key"] not in self.blends and room > 0:
+                    pending[preset["blend_key"]] = (preset, scale_weights(values, normalize))
+        if not pending:
+            return 0
+        styles = {}
+        if voices_checksum:
+            for key, (preset, _) in pending.items():
+                style = read_blend_sidecar(preset["path"], preset["config"], voices_checksum)
+                if style is not None:
+                    styles[key] = style
+        to_blend = [key for key in pending if key not in styles]
+        if to_blend:
+            styles.update(zip(to_blend, blender.blend_batch(np.stack([pending[key][1] for key in to_blend]))))
+        with self.lock:
+            self.blends.update(styles)
+        return len(styles)
+
+    def remember_blend(self, values, normalize, style):
+        """Keep a style vector, e.g. from a sidecar, for slider values aligned with blender.names."""
+        with self.lock:
+            self.blends[self.blend_key(values, normalize)] = style
+
+    def cached_blend(self, values, normalize):
+        """Precomputed style vector for slider values aligned with blender.names, or None."""
+        with self.lock:
+            return self.blends.get(self.blend_key(values, normalize))
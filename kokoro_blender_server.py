@@ -0,0 +1,435 @@
+"""Local synthesis server sharing one Kokoro model between other tools.
+
+Serves HTTP on localhost (or a Unix socket) from a single kokoro_onnx.Kokoro
+instance:
+
+    python kokoro_blender_server.py --port 8765
+    python kokoro_blender_server.py --unix /tmp/kokoro-blender.sock
+    python kokoro_blender_server.py --stub      # offline, with kokoro_blender_stub
+
+POST /synthesize takes a JSON body with the text and either voice weights
+(slider values divided by 100, as in saved configs) or the name of a config
+in the config directory, and streams back a 16-bit WAV sentence by sentence:
+
+    {"text": "Hello there.", "voice_weights": {"af_bella": 0.6, "am_adam": 0.4}, "speed": 1.0}
+    {"text": "Hello there.", "config": "my_mix"}
+
+Concurrent requests for the same text, blend, speed and language share one
+render. Renders wait in a bounded queue; when it is full the server answers
+503 with Retry-After instead of piling work onto the model. GET /metrics
+returns counters and latencies as JSON, GET /health answers once the model is
+loaded.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from kokoro_blender_cache import make_key
+from kokoro_blender_core import (
+    DEFAULT_CONFIG_DIR, DEFAULT_MODEL_PATH, DEFAULT_VOICES_PATH, SENTENCE_PAUSE, SESSION_SETTINGS_FILE, VOICES,
+    ConfigLibrary, PhonemeCache, VoiceBlender, VoiceStore, config_slider_values, file_checksum, load_pipeline,
+    read_blend_sidecar, read_session_settings, scale_weights, split_sentences
+)
+
+MAX_BODY_BYTES = 1024 * 1024
+# Speeds kokoro_onnx accepts; anything else fails inside the render
+MIN_SPEED, MAX_SPEED = 0.5, 2.0
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+def wav_header(sr):
+    """Header of a mono 16-bit WAV of unknown length, for streaming."""
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 0xFFFFFFFF, b"WAVE", b"fmt ", 16, 1, 1, sr, sr * 2, 2, 16, b"data", 0xFFFFFFFF
+    )
+
+
+def pcm16(samples):
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 1)
+
+
+class RequestError(Exception):
+    """A request the server answers with an HTTP error status."""
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class Render:
+    """One synthesis, shared by every request with the same key.
+
+    Chunks are kept until the render ends, so a request that joins late still
+    receives the audio from the start.
+    """
+    def __init__(self, key, text, values, normalize, speed, lang, config_path=None, config=None):
+        self.key = key
+        self.text = text
+        self.values = values  # Slider values (0-100) aligned with VOICES
+        self.normalize = normalize
+        self.speed = speed
+        self.lang = lang
+        self.config_path = config_path  # For a stored .blend.npz
+        self.config = config
+        self.chunks = []
+        self.sample_rate = None
+        self.done = False
+        self.error = None
+        self.subscribers = 0
+        self.changed = asyncio.Condition()
+
+    async def publish(self, samples=None, sr=None, done=False, error=None):
+        async with self.changed:
+            if samples is not None:
+                self.chunks.append(samples)
+                self.sample_rate = sr
+            self.done = self.done or done
+            self.error = error
+            self.changed.notify_all()
+
+    async def stream(self):
+        """Yield (samples, sr) from the first chunk on; raises RuntimeError if the render fails."""
+        index = 0
+        while True:
+            async with self.changed:
+                await self.changed.wait_for(lambda: index < len(self.chunks) or self.done)
+                chunks, done, error = self.chunks[index:], self.done, self.error
+            index += len(chunks)
+            for samples in chunks:
+                yield samples, self.sample_rate
+            if done and index >= len(self.chunks):
+                if error is not None:
+                    raise RuntimeError(error)
+                return
+
+
+class SynthesisServer:
+    """Coalesces requests into renders and runs them on a bounded queue in front of one pipeline."""
+    def __init__(self, pipeline, blender, config_library, voices_checksum, workers=1, queue_size=16, lang="en-us"):
+        self.pipeline = pipeline
+        self.blender = blender
+        self.config_library = config_library
+        self.voices_checksum = voices_checksum
+        self.available = np.array([voice in blender.index for voice in VOICES])  # Voices in the voices file
+        self.phoneme_cache = PhonemeCache(pipeline.tokenizer.phonemize)
+        self.workers = workers
+        self.lang = lang
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.inflight = {}  # key -> Render waiting or running
+        self.executor = ThreadPoolExecutor(max_workers=workers)  # ONNX Runtime releases the GIL
+        self.started = time.time()
+        self.counters = {
+            "requests": 0, "coalesced": 0, "rejected": 0, "bad_requests": 0, "renders": 0,
+            "failed_renders": 0, "cancelled_renders": 0, "audio_seconds": 0.0, "render_seconds": 0.0,
+        }
+        self.first_chunk_ms = deque(maxlen=1000)
+        self.total_ms = deque(maxlen=1000)
+        self.tasks = []
+
+    def start(self):
+        self.tasks = [asyncio.create_task(self.run_worker()) for _ in range(self.workers)]
+
+    def metrics(self):
+        counters = dict(self.counters)
+        counters["audio_seconds"] = round(counters["audio_seconds"], 3)
+        counters["render_seconds"] = round(counters["render_seconds"], 3)
+        return {
+            **counters,
+            "uptime_s": round(time.time() - self.started, 1),
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "in_flight": len(self.inflight),
+            "workers": self.workers,
+            "rtf": round(counters["render_seconds"] / counters["audio_seconds"], 3) if counters["audio_seconds"] else None,
+            "first_chunk_ms_p50": percentile(self.first_chunk_ms, 0.5),
+            "first_chunk_ms_p95": percentile(self.first_chunk_ms, 0.95),
+            "total_ms_p50": percentile(self.total_ms, 0.5),
+            "total_ms_p95": percentile(self.total_ms, 0.95),
+        }
+
+    def parse_request(self, body):
+        """Render for a /synthesize body, not yet queued. Raises RequestError for invalid input."""
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            raise RequestError(400, "Body must be JSON")
+        if not isinstance(request, dict):
+            raise RequestError(400, "Body must be a JSON object")
+        text = str(request.get("text", "")).strip()
+        if not text:
+            raise RequestError(400, "'text' is required")
+
+        config_path = None
+        if "config" in request:
+            self.config_library.refresh()
+            preset = self.config_library.preset(str(request["config"]))
+            if preset is None:
+                raise RequestError(404, f"Config not found: {request['config']}")
+            config, config_path = preset["config"], preset["path"]
+        elif isinstance(request.get("voice_weights"), dict):
+            config = {"voice_weights": request["voice_weights"], "normalize_sliders": request.get("normalize", True)}
+        else:
+            raise RequestError(400, "Pass 'voice_weights' or 'config'")
+
+        unknown = sorted(voice for voice in config["voice_weights"] if voice not in VOICES)
+        if unknown:
+            raise RequestError(400, f"Unknown voices: {', '.join(unknown)}")
+        weights = config["voice_weights"].values()
+        if not all(isinstance(weight, (int, float)) and not isinstance(weight, bool) for weight in weights):
+            raise RequestError(400, "Voice weights must be numbers")
+        if not all(math.isfinite(weight) and weight >= 0 for weight in weights):
+            raise RequestError(400, "Voice weights must be finite and not negative")
+        try:
+            speed = float(request.get("speed", config.get("speed", 1.0)))
+        except (TypeError, ValueError):
+            raise RequestError(400, "'speed' must be a number")
+        if not MIN_SPEED <= speed <= MAX_SPEED:
+            raise RequestError(400, f"'speed' must be between {MIN_SPEED} and {MAX_SPEED}")
+        values = config_slider_values(config, VOICES)
+        if not values[self.available].any():
+            raise RequestError(400, "At least one available voice weight must be greater than 0")
+        lang = str(request.get("lang", self.lang))
+        normalize = bool(config.get("normalize_sliders", True))
+        # The same key as the GUI's synthesis cache, at slider resolution
+        key = make_key(text, dict(zip(VOICES, values)), normalize, speed, lang)
+        return Render(key, text, values, normalize, speed, lang, config_path, config)
+
+    def submit(self, render):
+        """(render, coalesced) for a request: a waiting or running render with the same key, or the new one, queued."""
+        self.counters["requests"] += 1
+        running = self.inflight.get(render.key)
+        if running is not None:
+            self.counters["coalesced"] += 1
+            running.subscribers += 1
+            return running, True
+        try:
+            self.queue.put_nowait(render)
+        except asyncio.QueueFull:
+            self.counters["rejected"] += 1
+            raise RequestError(503, "Synthesis queue is full", {"Retry-After": "1"})
+        self.inflight[render.key] = render
+        render.subscribers += 1
+        return render, False
+
+    async def run_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            render = await self.queue.get()
+            try:
+                await self.render(render, loop)
+            finally:
+                self.queue.task_done()
+
+    def style(self, render):
+        """Blended style vector of a render, from the config's stored blend when it is valid."""
+        if render.config_path is not None:
+            style = read_blend_sidecar(render.config_path, render.config, self.voices_checksum)
+            if style is not None:
+                return style
+        weights = scale_weights(self.blender.weight_vector(dict(zip(VOICES, render.values))), render.normalize)
+        return self.blender.blend(weights)
+
+    def synthesize(self, sentence, style, render):
+        phonemes = self.phoneme_cache.phonemes(sentence, render.lang)
+        return self.pipeline.create(phonemes, voice=style, speed=render.speed, lang=render.lang, is_phonemes=True)
+
+    async def render(self, render, loop):
+        """Render sentence by sentence; stops early once every client has gone."""
+        started = time.perf_counter()
+        audio_seconds = 0.0
+        try:
+            style = await loop.run_in_executor(self.executor, self.style, render)
+            sentences = split_sentences(render.text)
+            for index, sentence in enumerate(sentences):
+                if render.subscribers == 0:
+                    self.counters["cancelled_renders"] += 1
+                    break
+                samples, sr = await loop.run_in_executor(self.executor, self.synthesize, sentence, style, render)
+                audio_seconds += len(samples) / sr
+                await render.publish(samples, sr)
+                if index < len(sentences) - 1:
+                    await render.publish(np.zeros(int(SENTENCE_PAUSE * sr), dtype=np.float32), sr)
+            self.counters["renders"] += 1
+            await render.publish(done=True)
+        except Exception as e:
+            self.counters["failed_renders"] += 1
+            await render.publish(done=True, error=str(e))
+        finally:
+            if self.inflight.get(render.key) is render:
+                del self.inflight[render.key]
+            self.counters["audio_seconds"] += audio_seconds
+            self.counters["render_seconds"] += time.perf_counter() - started
+
+    async def handle(self, reader, writer):
+        """Serve one HTTP/1.1 request, then close the connection."""
+        try:
+            try:
+                method, path, headers, body = await self.read_request(reader)
+                if path == "/synthesize":
+                    if method != "POST":
+                        raise RequestError(405, "Use POST")
+                    render, coalesced = self.submit(self.parse_request(body))
+                    await self.stream_audio(writer, render, coalesced)
+                elif path in ("/metrics", "/health"):
+                    if method != "GET":
+                        raise RequestError(405, "Use GET")
+                    payload = self.metrics() if path == "/metrics" else {"status": "ok"}
+                    await self.send_json(writer, 200, payload)
+                else:
+                    raise RequestError(404, f"No such endpoint: {path}")
+            except RequestError as e:
+                if e.status == 400:
+                    self.counters["bad_requests"] += 1
+                await self.send_json(writer, e.status, {"error": str(e)}, e.headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # The client went away
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        try:
+            method, path, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise RequestError(400, "Malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise RequestError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path.split("?", 1)[0], headers, body
+
+    async def send_json(self, writer, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        head = {"Content-Type": "application/json", "Content-Length": str(len(body)), **(headers or {})}
+        writer.write(self.status_line(status, head) + body)
+        await writer.drain()
+
+    @staticmethod
+    def status_line(status, headers):
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"] + [f"{name}: {value}" for name, value in headers.items()]
+        return ("\r\n".join(lines + ["Connection: close", "", ""])).encode("latin-1")
+
+    async def stream_audio(self, writer, render, coalesced):
+        """Send the render as a chunked WAV; the status goes out with the first chunk, so failures before it are 500s."""
+        started = time.perf_counter()
+        sent_head = False
+        try:
+            async for samples, sr in render.stream():
+                if not sent_head:
+                    writer.write(self.status_line(200, {
+                        "Content-Type": "audio/wav", "Transfer-Encoding": "chunked",
+                        "X-Sample-Rate": str(sr), "X-Coalesced": "1" if coalesced else "0",
+                    }))
+                    self.write_chunk(writer, wav_header(sr))
+                    self.first_chunk_ms.append((time.perf_counter() - started) * 1000)
+                    sent_head = True
+                self.write_chunk(writer, pcm16(samples))
+                await writer.drain()
+            if not sent_head:
+                raise RuntimeError("Nothing to synthesize")
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+            self.total_ms.append((time.perf_counter() - started) * 1000)
+        except RuntimeError as e:
+            if not sent_head:
+                await self.send_json(writer, 500, {"error": str(e)})
+            # Otherwise the missing final chunk tells the client the stream broke off
+        finally:
+            render.subscribers -= 1
+
+    @staticmethod
+    def write_chunk(writer, data):
+        writer.write(f"{len(data):X}\r\n".encode("latin-1") + data + b"\r\n")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Serve blended Kokoro voices over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port")
+    parser.add_argument("--unix", metavar="PATH", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=1, help="Renders run at the same time on the shared model")
+    parser.add_argument("--queue-size", type=int, default=16, help="Renders allowed to wait before requests get 503")
+    parser.add_argument("--lang", default="en-us", help="Default language passed to the phonemizer")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Path to kokoro.onnx")
+    parser.add_argument("--voices", default=DEFAULT_VOICES_PATH, help="Path to voices-v1.0.bin")
+    parser.add_argument("--config-dir", default=DEFAULT_CONFIG_DIR, help="Directory searched for config names")
+    parser.add_argument("--voice-store-dir", help="Directory for the memory-mapped voice stack (default: <config-dir>/cache/voices)")
+    parser.add_argument("--stub", action="store_true", help="Use the stub backend with generated voices instead of the model")
+    parser.add_argument("--stub-latency", type=float, default=0.02, help="Stub inference time per call in seconds")
+    return parser
+
+
+async def serve(args, server):
+    server.start()
+    if args.unix:
+        listener = await asyncio.start_unix_server(server.handle, path=args.unix)
+        where = args.unix
+    else:
+        listener = await asyncio.start_server(server.handle, args.host, args.port)
+        where = f"http://{args.host}:{args.port}"
+    print(f"Serving on {where} ({server.workers} workers, queue of {server.queue.maxsize})")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    session_settings = read_session_settings(os.path.join(args.config_dir, SESSION_SETTINGS_FILE))
+    if args.stub:
+        import kokoro_blender_stub
+        stub_dir = tempfile.mkdtemp(prefix="kokoro-server-")
+        args.voices = kokoro_blender_stub.write_voices(os.path.join(stub_dir, "voices.npz"))
+        args.voice_store_dir = args.voice_store_dir or os.path.join(stub_dir, "voices")
+        kokoro_blender_stub.install(latency=args.stub_latency, seconds_per_char=0.0005)
+        session_settings = None
+
+    voice_store_dir = args.voice_store_dir or os.path.join(args.config_dir, "cache", "voices")
+    pipeline = load_pipeline(args.model, args.voices, settings=session_settings)
+    voice_store = VoiceStore(args.voices, voice_store_dir)
+    blender = VoiceBlender(VOICES, voice_store)
+    if blender.missing:
+        print(f"Voices not found in {args.voices}: {', '.join(blender.missing)}")
+    config_library = ConfigLibrary(args.config_dir, VOICES, exclude={"last_blender_config.json"})
+    server = SynthesisServer(
+        pipeline, blender, config_library, file_checksum(args.voices),
+        workers=max(1, args.workers), queue_size=max(1, args.queue_size), lang=args.lang
+    )
+    try:
+        asyncio.run(serve(args, server))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""Deterministic stand-in for kokoro_onnx.Kokoro, for benchmarks and offline runs.
+
+install() registers a fake kokoro_onnx module, so load_pipeline() and the GUI
+pick up StubKokoro without the model files:
+
+    import kokoro_blender_stub
+    voices_path = kokoro_blender_stub.write_voices("/tmp/stub-voices.npz")
+    kokoro_blender_stub.install(latency=0.02, seconds_per_char=0.0005)
+
+The stub produces audio of a plausible length (about 60 ms per character) and
+sleeps for the configured synthetic inference time instead of running a model.
+"""
+import asyncio
+import re
+import sys
+import time
+import types
+
+import numpy as np
+
+from kokoro_blender_core import VOICES
+
+SAMPLE_RATE = 24000
+SECONDS_PER_CHAR = 0.06
+STYLE_SHAPE = (510, 1, 256)
+
+
+def write_voices(path, voices=VOICES, seed=0):
+    """Write a voices file in the voices-v1.0.bin (npz) layout filled with seeded noise."""
+    rng = np.random.default_rng(seed)
+    with open(path, "wb") as f:
+        np.savez(f, **{voice: rng.standard_normal(STYLE_SHAPE).astype(np.float32) for voice in voices})
+    return path
+
+
+class StubTokenizer:
+    def phonemize(self, text, lang="en-us"):
+        return " ".join(text.lower().split())
+
+
+class StubKokoro:
+    """Same calls as kokoro_onnx.Kokoro; synthesis cost is latency + seconds_per_char per character."""
+    latency = 0.0
+    seconds_per_char = 0.0
+
+    def __init__(self, model_path=None, voices_path=None):
+        self.voices = np.load(voices_path)
+        self.tokenizer = StubTokenizer()
+
+    @classmethod
+    def from_session(cls, session, voices_path):
+        return cls(voices_path=voices_path)
+
+    def create(self, text, voice, speed=1.0, lang="en-us", is_phonemes=False, trim=True):
+        if isinstance(voice, str):
+            voice = self.voices[voice]
+        time.sleep(self.latency + self.seconds_per_char * len(text))
+        # A tone whose pitch follows the style vector, so different blends differ audibly
+        frequency = 180.0 + 40.0 * float(np.tanh(np.mean(voice)))
+        samples = np.arange(int(len(text) * SECONDS_PER_CHAR * SAMPLE_RATE / speed), dtype=np.float32)
+        return (0.1 * np.sin(2 * np.pi * frequency / SAMPLE_RATE * samples)).astype(np.float32), SAMPLE_RATE
+
+    async def create_stream(self, text, voice, speed=1.0, lang="en-us", is_phonemes=False, trim=True):
+        for part in re.split(r"(?<=[.!?;:,])\s+", text):
+            if part.strip():
+                yield await asyncio.to_thread(self.create, part, voice, speed, lang, is_phonemes, trim)
+
+
+def install(latency=0.0, seconds_per_char=0.0):
+    """Make `import kokoro_onnx` return the stub."""
+    StubKokoro.latency = latency
+    StubKokoro.seconds_per_char = seconds_per_char
+    module = types.ModuleType("kokoro_onnx")
+    module.Kokoro = StubKokoro
+    module.SAMPLE_RATE = SAMPLE_RATE
+    sys.modules["kokoro_onnx"] = module
+    return module
@@ -1,24 +1,31 @@
+import time
+PROCESS_START = time.perf_counter()  # Reference point for the startup timings
 import sys
 import json
 import os
-import random
+import asyncio
+import itertools
+import threading
+from collections import deque
 import numpy as np
-try:
-    import kokoro_onnx
-except ImportError as e:
-    print(f"Error importing kokoro_onnx: {e}")
-    print("Please ensure 'kokoro-onnx' is installed in the active Python environment.")
-    print("Run: pip install kokoro-onnx")
-    sys.exit(1)
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QLabel, QTextEdit, QSlider, QMessageBox, QScrollArea, QSplitter, QCheckBox,
-    QComboBox, QGridLayout, QSpacerItem, QFileDialog, QDoubleSpinBox
+    QLabel, QLineEdit, QTextEdit, QSlider, QMessageBox, QScrollArea, QSplitter, QCheckBox,
+    QComboBox, QGridLayout, QSpacerItem, QFileDialog, QDoubleSpinBox, QSpinBox, QProgressBar,
+    QDialog, QDialogButtonBox, QFormLayout, QListWidget, QListWidgetItem, QInputDialog
 )
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QMouseEvent
-import soundfile as sf
-import pygame
+from PyQt5.QtCore import Qt, QObject, QSize, QTimer, QFileSystemWatcher, pyqtSignal
+from PyQt5.QtGui import QColor, QIcon, QMouseEvent, QPainter, QPixmap
+# kokoro_onnx, soundfile and pygame are imported where first used, so the window shows without waiting for them
+from kokoro_blender_core import (
+    AUDIO_FORMATS, DEFAULT_CONFIG_DIR, DEFAULT_MODEL_PATH, DEFAULT_VOICES_PATH, EXECUTION_MODES, GRAPH_OPTIMIZATIONS,
+    MODEL_VARIANTS, MODEL_VARIANTS_FILE, SENTENCE_PAUSE, SESSION_SETTINGS_FILE, VOICES, WARM_UP_TEXT,
+    ConfigLibrary, ModelVariants, PhonemeCache, StageTimer, StreamingAudioWriter, VoiceBlender, VoiceStore, WeightModel, blend_sidecar_path,
+    compare_pipelines, draw_random_values, export_voices, file_checksum, iter_chunks, join_audio, load_pipeline, open_timing_log,
+    profile_job, quantize_model, read_blend_sidecar, read_session_settings, render_chunks, resident_memory_mb, scale_weights, split_long_text,
+    split_sentences, sweep_thread_counts, write_blend_sidecar, write_session_settings
+)
+from kokoro_blender_cache import SynthesisCache, make_key
 
 class CustomSlider(QSlider):
     """Custom QSlider that jumps to the clicked position."""
@@ -29,6 +36,545 @@ class CustomSlider(QSlider):
             self.setValue(int(val))
         super().mousePressEvent(event)
 
+# Random blends kept pre-rendered per button
+SPECULATIVE_DEPTH = 3
+
+# Audition board: waveform thumbnail size of a candidate
+THUMBNAIL_WIDTH = 96
+THUMBNAIL_HEIGHT = 24
+
+# Job priorities for the synthesis worker (lower runs first)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2
+
+# Synthesize and Save targets; the format follows the extension
+AUDIO_FILE_FILTER = "WAV (*.wav);;FLAC (*.flac);;OGG Vorbis (*.ogg)"
+
+# Jobs that run beside previews instead of ahead of them
+BACKGROUND_SLOTS = ("save", "audition", "speculate", "sentences", "presets", "sweep", "quantize")
+
+# Auto-loop: the next iteration is handed to the mixer this long before the current one ends
+LOOP_LEAD = 0.25
+LOOP_CROSSFADE = 0.05
+# Playback: wait this long before feeding again when the channel has not caught up with the estimate
+FEED_RETRY = 0.005
+
+def waveform_pixmap(samples, width=THUMBNAIL_WIDTH, height=THUMBNAIL_HEIGHT):
+    """Peak envelope of the samples drawn as a small pixmap."""
+    pixmap = QPixmap(width, height)
+    pixmap.fill(Qt.transparent)
+    bins = np.array_split(np.abs(np.asarray(samples, dtype=np.float32)), width)
+    peaks = np.array([part.max() if len(part) else 0.0 for part in bins])
+    peaks /= max(float(peaks.max()), 1e-6)
+    painter = QPainter(pixmap)
+    painter.setPen(QColor(60, 120, 200))
+    middle = height // 2
+    for x, peak in enumerate(peaks):
+        extent = max(1, int(peak * (middle - 1)))
+        painter.drawLine(x, middle - extent, x, middle + extent)
+    painter.end()
+    return pixmap
+
+class SynthesisWorker(QObject):
+    """Background threads running synthesis jobs off the GUI thread.
+
+    Jobs are submitted into named slots ("preview", "save", ...). Each slot
+    holds at most one pending job: submitting again replaces the pending job
+    and bumps the slot generation, so a result that finishes for an older
+    generation is stale and gets discarded by the receiver (latest wins).
+
+    Slots in background_slots run on a thread of their own, so a long save or
+    audition never holds up a preview; priority orders the jobs of one thread.
+
+    A job is called as fn(progress); progress(payload) emits job_progress for
+    partial results and returns False once the job has been superseded.
+    """
+    job_progress = pyqtSignal(str, int, object, object)  # slot, generation, payload, context
+    job_finished = pyqtSignal(str, int, object, object)  # slot, generation, result, context
+    job_failed = pyqtSignal(str, int, str, object)  # slot, generation, error, context
+
+    def __init__(self, parent=None, background_slots=()):
+        super().__init__(parent)
+        self._background_slots = frozenset(background_slots)
+        self._condition = threading.Condition()
+        self._pending = {}  # slot -> (priority, order, generation, fn, context)
+        self._generations = {}
+        self._active_slots = set()
+        self._order = itertools.count()
+        self._stopped = False
+        self._threads = [
+            threading.Thread(target=self.run, args=(background,), name=name, daemon=True)
+            for background, name in ((False, "SynthesisWorker"), (True, "SynthesisWorker-background"))
+        ]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, slot, fn, priority=PRIORITY_NORMAL, context=None):
+        """Queue fn() for the slot, superseding older jobs in it. Returns the generation."""
+        with self._condition:
+            generation = self._generations.get(slot, 0) + 1
+            self._generations[slot] = generation
+            self._pending[slot] = (priority, next(self._order), generation, fn, context)
+            self._condition.notify_all()
+        return generation
+
+    def cancel(self, slot):
+        """Drop the pending job of a slot and mark a running one as stale."""
+        with self._condition:
+            self._generations[slot] = self._generations.get(slot, 0) + 1
+            self._pending.pop(slot, None)
+
+    def is_current(self, slot, generation):
+        with self._condition:
+            return self._generations.get(slot) == generation
+
+    def is_busy(self, slot):
+        """True while a job of the slot is pending or running."""
+        with self._condition:
+            return slot in self._pending or slot in self._active_slots
+
+    def stop(self, timeout=0.5):
+        """Drop pending jobs and mark running ones stale, so they stop at their next progress() call.
+
+        Waits at most timeout seconds for each thread; a job still inside one
+        inference call finishes on its daemon thread without holding up exit.
+        """
+        with self._condition:
+            self._stopped = True
+            self._pending.clear()
+            for slot in self._generations.keys() | self._active_slots:
+                self._generations[slot] = self._generations.get(slot, 0) + 1
+            self._condition.notify_all()
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout)
+
+    def run(self, background):
+        def runnable():
+            return [slot for slot in self._pending if (slot in self._background_slots) == background]
+
+        while True:
+            with self._condition:
+                while not runnable() and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                slot = min(runnable(), key=lambda s: self._pending[s][:2])
+                _, _, generation, fn, context = self._pending.pop(slot)
+                self._active_slots.add(slot)
+
+            def progress(payload, slot=slot, generation=generation, context=context):
+                self.job_progress.emit(slot, generation, payload, context)
+                return self.is_current(slot, generation)
+
+            try:
+                result = fn(progress)
+                error = None
+            except Exception as e:
+                error = str(e)
+            # Idle before emitting, so receivers can submit to the same slot again
+            with self._condition:
+                self._active_slots.discard(slot)
+            if error is None:
+                self.job_finished.emit(slot, generation, result, context)
+            else:
+                self.job_failed.emit(slot, generation, error, context)
+
+class AudioPlayer(QObject):
+    """Plays float32 sample arrays straight from memory on one mixer channel.
+
+    The mixer is opened once in 32-bit float mono at the pipeline's sample
+    rate, so pipeline output is handed to pygame without conversion or a
+    temporary file. Chunks passed to append() play back to back gaplessly.
+
+    loop() repeats a buffer gaplessly: each iteration is queued on the channel
+    shortly before the previous one ends, and a buffer passed while the loop
+    runs takes over at the next iteration boundary.
+
+    Nothing polls the channel: feed() works out from the sound lengths when the
+    queue slot frees up or the next iteration is due and arms a single-shot
+    timer for that moment.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sample_rate = None
+        self.channel = None
+        self.pending = deque()
+        self.play_deadline = 0.0  # When everything handed to the channel has played
+        self.queue_free_at = 0.0  # When the channel's queue slot frees up
+        self.loop_samples = None  # Buffer repeated by the loop
+        self.loop_next = None  # Buffer taking over at the next boundary
+        self.loop_tail = None  # End of the last iteration, held back for a crossfade
+        self.loop_repeat = False
+        self.loop_crossfade = 0.0
+        self.feed_timer = QTimer(self)
+        self.feed_timer.setSingleShot(True)
+        self.feed_timer.setTimerType(Qt.PreciseTimer)
+        self.feed_timer.timeout.connect(self.feed)
+
+    def ensure_mixer(self, sr):
+        import pygame
+        if pygame.mixer.get_init() and self.sample_rate == sr:
+            return
+        self.stop()
+        pygame.mixer.quit()
+        # No allowed changes: SDL converts to the device format itself, so Sound(buffer=...) is always
+        # read as float32 mono at sr instead of at whatever rate or channel count the device prefers
+        pygame.mixer.init(frequency=sr, size=32, channels=1, allowedchanges=0)
+        if pygame.mixer.get_init() != (sr, -32, 1):
+            opened = pygame.mixer.get_init()
+            pygame.mixer.quit()
+            raise RuntimeError(f"Audio mixer opened as {opened} instead of {sr} Hz float32 mono")
+        self.sample_rate = sr
+        self.channel = pygame.mixer.Channel(0)
+
+    def play(self, samples, sr):
+        """Replace whatever is playing with samples."""
+        self.stop()
+        self.append(samples, sr)
+
+    def append(self, samples, sr):
+        """Queue samples to play after everything already queued."""
+        import pygame
+        self.ensure_mixer(sr)
+        # pygame reads the array through the buffer protocol, no copy for float32 input
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        self.pending.append(pygame.mixer.Sound(buffer=samples))
+        self.feed()
+
+    def loop(self, samples, sr, repeat=True, crossfade=0.0, playing=False):
+        """Play samples at the next iteration boundary and repeat them if repeat is set.
+
+        With nothing playing they start right away, otherwise the current
+        iteration finishes first and, with crossfade > 0, fades into them over
+        that many seconds. playing=True marks samples as already playing (a
+        streamed preview), so they are only repeated.
+        """
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        self.loop_repeat = repeat
+        self.loop_crossfade = crossfade
+        if playing:
+            self.loop_samples = samples
+            self.loop_next = None
+            self.loop_tail = None
+        else:
+            if self.sample_rate != sr:
+                self.stop()
+            self.ensure_mixer(sr)
+            self.loop_next = samples
+        self.feed()
+
+    def set_loop_repeat(self, repeat):
+        self.loop_repeat = repeat
+        if self.is_looping() and self.channel is not None:
+            self.feed()
+
+    def is_looping(self):
+        return self.loop_next is not None or self.loop_tail is not None or (self.loop_repeat and self.loop_samples is not None)
+
+    def next_loop_iteration(self):
+        """Samples of the next loop iteration, or None once the loop has ended."""
+        if self.loop_next is not None:
+            samples, swap = self.loop_next, True
+            self.loop_next = None
+            self.loop_samples = samples
+        elif self.loop_repeat and self.loop_samples is not None:
+            samples, swap = self.loop_samples, False
+        else:
+            # Loop ended; play out the held back tail
+            tail, self.loop_tail = self.loop_tail, None
+            return tail
+
+        tail = self.loop_tail if self.loop_tail is not None else samples[:0]
+        held_back = min(int(self.loop_crossfade * self.sample_rate), len(samples) // 4)
+        body = samples[:len(samples) - held_back]
+        self.loop_tail = samples[len(body):] if held_back else None
+        if swap and len(tail) and len(body) >= len(tail):
+            # The previous blend fades out while the new one fades in
+            ramp = np.linspace(0.0, 1.0, len(tail), dtype=np.float32)
+            head = tail * (1.0 - ramp) + body[:len(tail)] * ramp
+            return np.concatenate([head, body[len(tail):]])
+        return np.concatenate([tail, body]) if len(tail) else body
+
+    def feed(self):
+        if self.channel is None:
+            self.feed_timer.stop()
+            return
+        import pygame
+        now = time.perf_counter()
+        busy = self.channel.get_busy()
+        if not self.pending and self.is_looping() and (not busy or self.play_deadline - now < LOOP_LEAD):
+            samples = self.next_loop_iteration()
+            if samples is not None and len(samples):
+                self.pending.append(pygame.mixer.Sound(buffer=samples))
+        # Keep one sound playing and one queued behind it
+        if self.pending and not busy:
+            sound = self.pending.popleft()
+            self.channel.play(sound)
+            self.play_deadline = now + sound.get_length()
+            self.queue_free_at = now
+        if self.pending and self.channel.get_queue() is None:
+            sound = self.pending.popleft()
+            self.channel.queue(sound)
+            self.queue_free_at = max(self.play_deadline, now)
+            self.play_deadline = self.queue_free_at + sound.get_length()
+        self.schedule_feed(now)
+
+    def schedule_feed(self, now):
+        """Arm the feed timer for the next moment feed() has work, or stop it when there is none."""
+        if self.pending:
+            wake = self.queue_free_at
+        elif self.is_looping():
+            wake = self.play_deadline - LOOP_LEAD
+        else:
+            self.feed_timer.stop()
+            return
+        # Retry shortly when the moment has passed but the device runs behind the estimate
+        wake = max(wake, now + FEED_RETRY)
+        self.feed_timer.start(int((wake - now) * 1000) + 1)
+
+    def stop(self):
+        self.feed_timer.stop()
+        self.pending.clear()
+        self.loop_samples = None
+        self.loop_next = None
+        self.loop_tail = None
+        if self.channel is None:
+            return
+        import pygame
+        if pygame.mixer.get_init():
+            self.channel.stop()
+
+    def is_busy(self):
+        if self.pending or self.is_looping():
+            return True
+        if self.channel is None:
+            return False
+        import pygame
+        return bool(pygame.mixer.get_init()) and self.channel.get_busy()
+
+class SessionSettingsDialog(QDialog):
+    """Edit the ONNX Runtime session settings; the thread sweep runs on the window's worker."""
+    def __init__(self, settings, run_sweep, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Session Settings")
+        self.run_sweep = run_sweep
+        layout = QFormLayout(self)
+
+        cpus = os.cpu_count() or 1
+        self.intra_spinbox = QSpinBox()
+        self.intra_spinbox.setRange(0, cpus * 2)
+        self.intra_spinbox.setSpecialValueText("Auto")
+        self.intra_spinbox.setValue(int(settings["intra_op_threads"]))
+        layout.addRow("Intra-op threads:", self.intra_spinbox)
+
+        self.inter_spinbox = QSpinBox()
+        self.inter_spinbox.setRange(0, cpus * 2)
+        self.inter_spinbox.setSpecialValueText("Auto")
+        self.inter_spinbox.setValue(int(settings["inter_op_threads"]))
+        layout.addRow("Inter-op threads:", self.inter_spinbox)
+
+        self.execution_combo = QComboBox()
+        self.execution_combo.addItems(EXECUTION_MODES)
+        self.execution_combo.setCurrentText(settings["execution_mode"])
+        layout.addRow("Execution mode:", self.execution_combo)
+
+        self.optimization_combo = QComboBox()
+        self.optimization_combo.addItems(GRAPH_OPTIMIZATIONS)
+        self.optimization_combo.setCurrentText(settings["graph_optimization"])
+        layout.addRow("Graph optimization:", self.optimization_combo)
+
+        optimized_layout = QHBoxLayout()
+        self.optimized_input = QLineEdit(settings["optimized_model_path"])
+        self.optimized_input.setPlaceholderText("Optional, e.g. configs/cache/kokoro.optimized.onnx")
+        optimized_layout.addWidget(self.optimized_input)
+        browse_btn = QPushButton("Browse...")
+        browse_btn.clicked.connect(self.browse_optimized_path)
+        optimized_layout.addWidget(browse_btn)
+        layout.addRow("Saved optimized model:", optimized_layout)
+
+        sweep_layout = QHBoxLayout()
+        self.sweep_btn = QPushButton("Find Fastest Thread Count")
+        self.sweep_btn.clicked.connect(self.start_sweep)
+        sweep_layout.addWidget(self.sweep_btn)
+        self.sweep_label = QLabel()
+        sweep_layout.addWidget(self.sweep_label)
+        layout.addRow(sweep_layout)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def browse_optimized_path(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Saved Optimized Model", self.optimized_input.text(), "ONNX Models (*.onnx)")
+        if file_path:
+            self.optimized_input.setText(file_path)
+
+    def settings(self):
+        return {
+            "intra_op_threads": self.intra_spinbox.value(),
+            "inter_op_threads": self.inter_spinbox.value(),
+            "execution_mode": self.execution_combo.currentText(),
+            "graph_optimization": self.optimization_combo.currentText(),
+            "optimized_model_path": self.optimized_input.text().strip(),
+        }
+
+    def start_sweep(self):
+        self.sweep_btn.setEnabled(False)
+        self.sweep_label.setText("Measuring...")
+        self.run_sweep(self.settings())
+
+    def show_sweep_result(self, threads, milliseconds):
+        self.sweep_label.setText(f"{threads} threads: {milliseconds:.0f} ms")
+
+    def finish_sweep(self, results):
+        self.sweep_btn.setEnabled(True)
+        if not results:
+            self.sweep_label.setText("Sweep failed")
+            return
+        best = next(iter(results))
+        self.intra_spinbox.setValue(best)
+        self.sweep_label.setText("Fastest: " + ", ".join(f"{threads} threads {ms:.0f} ms" for threads, ms in results.items()))
+
+class ModelVariantsDialog(QDialog):
+    """Register fp32/fp16/int8 model files, pick the preview and save variants and A/B them.
+
+    Quantization and the A/B render run on the window's worker through the
+    run_quantize and run_compare callbacks.
+    """
+    def __init__(self, variants, default_int8_path, run_quantize, run_compare, play, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Model Variants")
+        self.default_int8_path = default_int8_path
+        self.run_quantize = run_quantize
+        self.run_compare = run_compare
+        self.play = play
+        self.compared = {}
+        layout = QFormLayout(self)
+
+        self.path_inputs = {}
+        for name in MODEL_VARIANTS:
+            path_layout = QHBoxLayout()
+            path_input = QLineEdit(variants.paths.get(name, ""))
+            path_input.setPlaceholderText("Not registered")
+            path_layout.addWidget(path_input)
+            browse_btn = QPushButton("Browse...")
+            browse_btn.clicked.connect(lambda checked, target=path_input: self.browse_model(target))
+            path_layout.addWidget(browse_btn)
+            layout.addRow(f"{name} model:", path_layout)
+            self.path_inputs[name] = path_input
+
+        quantize_layout = QHBoxLayout()
+        self.quantize_btn = QPushButton("Create int8 Copy of fp32")
+        self.quantize_btn.clicked.connect(self.start_quantize)
+        quantize_layout.addWidget(self.quantize_btn)
+        self.quantize_label = QLabel()
+        quantize_layout.addWidget(self.quantize_label)
+        layout.addRow(quantize_layout)
+
+        self.role_combos = {}
+        for role, label in (("preview", "Preview uses:"), ("save", "Synthesize and Save uses:")):
+            combo = QComboBox()
+            combo.addItems(MODEL_VARIANTS)
+            combo.setCurrentText(variants.roles[role])
+            layout.addRow(label, combo)
+            self.role_combos[role] = combo
+
+        compare_layout = QHBoxLayout()
+        self.compare_a_combo = QComboBox()
+        self.compare_a_combo.addItems(MODEL_VARIANTS)
+        compare_layout.addWidget(self.compare_a_combo)
+        compare_layout.addWidget(QLabel("vs"))
+        self.compare_b_combo = QComboBox()
+        self.compare_b_combo.addItems(MODEL_VARIANTS)
+        self.compare_b_combo.setCurrentText("int8")
+        compare_layout.addWidget(self.compare_b_combo)
+        self.compare_btn = QPushButton("A/B Render")
+        self.compare_btn.clicked.connect(self.start_compare)
+        compare_layout.addWidget(self.compare_btn)
+        self.play_a_btn = QPushButton("Play A")
+        self.play_a_btn.clicked.connect(lambda: self.play(*self.compared["a"]))
+        compare_layout.addWidget(self.play_a_btn)
+        self.play_b_btn = QPushButton("Play B")
+        self.play_b_btn.clicked.connect(lambda: self.play(*self.compared["b"]))
+        compare_layout.addWidget(self.play_b_btn)
+        for button in (self.play_a_btn, self.play_b_btn):
+            button.setEnabled(False)
+        layout.addRow(compare_layout)
+        self.compare_label = QLabel("Renders the current text and blend with both variants.")
+        layout.addRow(self.compare_label)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def browse_model(self, path_input):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Model File", path_input.text(), "ONNX Models (*.onnx)")
+        if file_path:
+            path_input.setText(file_path)
+
+    def paths(self):
+        return {name: path_input.text().strip() for name, path_input in self.path_inputs.items() if path_input.text().strip()}
+
+    def roles(self):
+        return {role: combo.currentText() for role, combo in self.role_combos.items()}
+
+    def accept(self):
+        paths = self.paths()
+        missing = [name for name in set(self.roles().values()) if not os.path.exists(paths.get(name, ""))]
+        if missing:
+            QMessageBox.critical(self, "Error", f"No model file for: {', '.join(sorted(missing))}")
+            return
+        super().accept()
+
+    def start_quantize(self):
+        source = self.paths().get("fp32", "")
+        if not os.path.exists(source):
+            QMessageBox.critical(self, "Error", "Register an existing fp32 model first.")
+            return
+        output = self.path_inputs["int8"].text().strip() or self.default_int8_path
+        self.quantize_btn.setEnabled(False)
+        self.quantize_label.setText("Quantizing...")
+        self.run_quantize(source, output)
+
+    def finish_quantize(self, output_path, error=None):
+        self.quantize_btn.setEnabled(True)
+        if error is not None:
+            self.quantize_label.setText(f"Failed: {error}")
+            return
+        self.path_inputs["int8"].setText(output_path)
+        self.quantize_label.setText(f"Written to {output_path}")
+
+    def start_compare(self):
+        paths = self.paths()
+        sides = (self.compare_a_combo.currentText(), self.compare_b_combo.currentText())
+        missing = [name for name in sides if not os.path.exists(paths.get(name, ""))]
+        if missing:
+            QMessageBox.critical(self, "Error", f"No model file for: {', '.join(missing)}")
+            return
+        self.compare_btn.setEnabled(False)
+        self.compare_label.setText("Rendering...")
+        self.run_compare(paths[sides[0]], paths[sides[1]])
+
+    def finish_compare(self, report=None, samples_a=None, samples_b=None, sr=None, error=None):
+        self.compare_btn.setEnabled(True)
+        if error is not None:
+            self.compare_label.setText(f"A/B render failed: {error}")
+            return
+        self.compared = {"a": (samples_a, sr), "b": (samples_b, sr)}
+        for button in (self.play_a_btn, self.play_b_btn):
+            button.setEnabled(True)
+        self.compare_label.setText(
+            f"A {report['a_ms']:.0f} ms, B {report['b_ms']:.0f} ms ({report['speedup']:.2f}x) | "
+            f"SNR {report['snr_db']:.1f} dB, correlation {report['correlation']:.3f}, "
+            f"length difference {report['length_diff_s']:+.2f} s"
+        )
+
 class KokoroVoiceBlender(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -36,41 +582,47 @@ class KokoroVoiceBlender(QMainWindow):
         self.setGeometry(100, 100, 800, 700)
 
         # Paths to model files
-        self.model_path = "/home/pg/Dokumente/Kokoro-82M/kokoro.onnx"
-        self.voices_path = "/home/pg/Dokumente/Kokoro-82M/voices-v1.0.bin"
-        self.config_dir = "/home/pg/Dokumente/Kokoro-82M/configs"
+        self.model_path = DEFAULT_MODEL_PATH
+        self.voices_path = DEFAULT_VOICES_PATH
+        self.config_dir = DEFAULT_CONFIG_DIR
         self.last_config_path = os.path.join(self.config_dir, "last_blender_config.json")
-
-        # Initialize Kokoro pipeline (CPU only)
-        self.device = "cpu"
-        try:
-            self.pipeline = kokoro_onnx.Kokoro(
-                model_path=self.model_path,
-                voices_path=self.voices_path
-            )
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to initialize Kokoro pipeline: {str(e)}")
-            sys.exit(1)
+        self.cache_dir = os.path.join(self.config_dir, "cache")
+        self.voice_store_dir = os.path.join(self.cache_dir, "voices")
+        self.custom_voices_path = os.path.join(self.config_dir, "voices-custom.bin")  # Exported blends
+        self.output_path = os.path.abspath("output_blended.wav")  # Last Synthesize and Save target
+
+        # Kokoro pipeline (CPU only), loaded in the background by load_model
+        self.session_settings_path = os.path.join(self.config_dir, SESSION_SETTINGS_FILE)
+        self.session_settings = read_session_settings(self.session_settings_path)
+        self.session_dialog = None
+        # Model files per variant; previews and saves can run on different ones
+        self.variants = ModelVariants(os.path.join(self.config_dir, MODEL_VARIANTS_FILE), self.model_path)
+        self.variants_dialog = None
+        self.pipelines = {}  # Model path -> loaded pipeline
+        self.pipelines_lock = threading.Lock()
+        self.pipeline = None  # Preview pipeline
+        self.blender = None
+        self.phoneme_cache = None
+        self.voices_checksum = None  # Identifies the voices file in synthesis cache keys
+        self.startup_times = {}
+        self.startup_memory = {}
+        self.startup_timer = StageTimer("startup")
+        # Per-stage render timings, one JSON line per render, for aggregating across machines
+        self.timing_log = open_timing_log(os.path.join(self.config_dir, "logs", "timings.jsonl"))
 
         # Available voices
-        self.voices = [
-            "af_alloy", "af_aoede", "af_bella", "af_heart", "af_jessica", "af_kore", "af_nicole", "af_nova", "af_river", "af_sarah", "af_sky",
-            "am_adam", "am_echo", "am_eric", "am_fenrir", "am_liam", "am_michael", "am_onyx", "am_puck", "am_santa",
-            "bf_alice", "bf_emma", "bf_isabella", "bf_lily",
-            "bm_daniel", "bm_fable", "bm_george", "bm_lewis",
-            "ef_dora", "em_alex", "em_santa",
-            "ff_siwis",
-            "hf_alpha", "hf_beta", "hm_omega", "hm_psi",
-            "if_sara", "im_nicola",
-            "jf_alpha", "jf_gongitsune", "jf_nezumi", "jf_tebukuro", "jm_kumo",
-            "pf_dora", "pm_alex", "pm_santa",
-            "zf_xiaobei", "zf_xiaoni", "zf_xiaoxiao", "zf_xiaoyi",
-            "zm_yunjian", "zm_yunxia", "zm_yunxi", "zm_yunyang"
-        ]
+        self.voices = list(VOICES)
+        self.voice_index = {voice: i for i, voice in enumerate(self.voices)}
+        self.missing_indices = []  # Voices not found in the voices file
+        self.blend_columns = None  # Positions of blender.names in self.voices
+
+        # Slider state (percent per voice); widgets only mirror it
+        self.weight_model = WeightModel(len(self.voices))
 
         # Initialize sliders and labels
         self.sliders = {}
         self.labels = {}
+        self.slider_rows = {}  # Voice -> row widget holding its label and slider
         self.slider_changed = False
         self.columns = 1  # Default: 1 slider per row
         self.normalize_sliders = True  # Default: Normalize sliders to sum to 1
@@ -81,20 +633,244 @@ class KokoroVoiceBlender(QMainWindow):
         self.debounce_timer = QTimer()
         self.debounce_timer.setSingleShot(True)
         self.debounce_timer.timeout.connect(self.process_debounced_slider_change)
-        self.pending_voice = None
+        self.pending_voice = None  # Last voice moved, kept fixed by normalization
         self.pending_value = None
+        self.pending_indices = set()  # Every slider moved since the last debounced update
 
         # Auto-loop variables
         self.auto_loop = False
         self.continuous_loop = False
+        # Slider changes reach the loop after a short settle instead of a poll
         self.loop_timer = QTimer()
+        self.loop_timer.setSingleShot(True)
         self.loop_timer.timeout.connect(self.run_auto_loop)
+        self.preview_is_auto_loop = False
+
+        # Presets: the configs in config_dir, indexed in memory and re-indexed when files change
+        self.config_library = ConfigLibrary(self.config_dir, self.voices, exclude={os.path.basename(self.last_config_path)})
+        self.config_watcher = QFileSystemWatcher(self)
+        self.config_watcher.directoryChanged.connect(self.schedule_preset_refresh)
+        self.config_watcher.fileChanged.connect(self.schedule_preset_refresh)
+        self.preset_timer = QTimer()
+        self.preset_timer.setSingleShot(True)
+        self.preset_timer.timeout.connect(self.refresh_presets)
+
+        # Rendered audio, reused when the same text, blend and speed come up again
+        self.synthesis_cache = SynthesisCache(max_bytes=256 * 1024 * 1024, disk_dir=self.cache_dir)
+
+        # In-memory playback; streaming previews append chunks as they arrive
+        self.player = AudioPlayer(self)
+        self.streaming_preview = False
+        self.stream_generation = None
+
+        # Upcoming Randomize/Refresh blends, pre-rendered into the synthesis cache in the background
+        self.speculative_blends = {"randomize": deque(), "refresh": deque()}
+        self.speculative_active = None  # Active voices the refresh blends were drawn for
+        self.speculated_keys = set()
+        self.speculate_timer = QTimer()
+        self.speculate_timer.setSingleShot(True)
+        self.speculate_timer.timeout.connect(self.speculate)
+
+        # Audition board: random candidate blends rendered side by side, index -> {"values", "audio"}
+        self.audition_candidates = []
+
+        # Background synthesis (keeps the GUI responsive while rendering)
+        self.synthesis_worker = SynthesisWorker(self, background_slots=BACKGROUND_SLOTS)
+        self.synthesis_worker.job_progress.connect(self.on_synthesis_progress)
+        self.synthesis_worker.job_finished.connect(self.on_synthesis_finished)
+        self.synthesis_worker.job_failed.connect(self.on_synthesis_failed)
+        self.synthesis_worker.start()
 
         # Setup GUI
-        self.init_ui()
+        with self.startup_timer.stage("init_ui"):
+            self.init_ui()
 
         # Load last configuration if exists
-        self.load_last_config()
+        with self.startup_timer.stage("load_config"):
+            self.load_last_config()
+
+        # Index the presets; the other app's writes are picked up by the watcher
+        with self.startup_timer.stage("index_presets"):
+            self.refresh_presets()
+
+        # Load the model while the window is already usable
+        self.set_model_ready(False)
+        self.statusBar().showMessage("Loading model...")
+        self.synthesis_worker.submit("load", self.load_model, priority=PRIORITY_INTERACTIVE)
+        self.startup_times["window_ready"] = time.perf_counter() - PROCESS_START
+
+    def load_model(self, progress):
+        """Load the pipeline, voice matrix and phoneme cache. Runs on the synthesis worker."""
+        self.startup_memory["rss_before_model_mb"] = round(resident_memory_mb(), 1)
+        try:
+            with self.startup_timer.stage("load_pipeline"):
+                pipeline = self.pipeline_for(self.variants.model_path("preview"))
+        except ImportError as e:
+            raise RuntimeError(f"{str(e)}. Please ensure 'kokoro-onnx' is installed: pip install kokoro-onnx")
+        # Blend from the memory-mapped voice pack; missing voices are found once here
+        with self.startup_timer.stage("voice_store"):
+            try:
+                voice_store = VoiceStore(self.voices_path, self.voice_store_dir)
+            except Exception as e:
+                print(f"Failed to map voices, loading them into memory: {str(e)}")
+                voice_store = pipeline.voices
+            blender = VoiceBlender(self.voices, voice_store)
+        with self.startup_timer.stage("voices_checksum"):
+            self.voices_checksum = file_checksum(self.voices_path)
+        self.startup_memory["rss_after_model_mb"] = round(resident_memory_mb(), 1)
+        return pipeline, blender, PhonemeCache(pipeline.tokenizer.phonemize)
+
+    def pipeline_for(self, model_path):
+        """Pipeline for a model file, loaded on first use. Runs on worker threads."""
+        with self.pipelines_lock:
+            pipeline = self.pipelines.get(model_path)
+            if pipeline is None:
+                pipeline = load_pipeline(model_path, self.voices_path, settings=self.session_settings)
+                self.pipelines[model_path] = pipeline
+            return pipeline
+
+    def release_unused_pipelines(self):
+        """Drop sessions that neither previews nor saves use, e.g. after an A/B render."""
+        in_use = {self.variants.model_path("preview"), self.variants.model_path("save")}
+        with self.pipelines_lock:
+            for model_path in [path for path in self.pipelines if path not in in_use]:
+                del self.pipelines[model_path]
+
+    def on_model_loaded(self, pipeline, blender, phoneme_cache):
+        self.pipeline = pipeline
+        self.blender = blender
+        self.phoneme_cache = phoneme_cache
+        self.blend_columns = np.array([self.voice_index[voice] for voice in blender.names], dtype=np.intp)
+        if blender.missing:
+            print(f"Voices not found in {self.voices_path}: {', '.join(blender.missing)}")
+            self.missing_indices = [self.voice_index[voice] for voice in blender.missing]
+            for voice in blender.missing:
+                self.sliders[voice].setEnabled(False)
+            self.set_slider_values(self.weight_model.values)
+            if self.normalize_sliders:
+                self.adjust_sliders_to_sum_one(None)
+            QMessageBox.warning(self, "Warning", f"Voices not found and skipped: {', '.join(blender.missing)}")
+        self.set_model_ready(True)
+        # The first inference of a session is much slower than the rest; pay for it now
+        self.synthesis_worker.submit("warmup", self.warm_up, priority=PRIORITY_BACKGROUND)
+        self.precompute_preset_blends()
+        self.schedule_speculation()
+        if "model_ready" not in self.startup_times:
+            self.startup_times["model_ready"] = time.perf_counter() - PROCESS_START
+            self.log_startup_times()
+        else:
+            self.statusBar().showMessage(f"Model reloaded, previews use {self.variants.roles['preview']}")
+
+    def set_model_ready(self, ready):
+        for button in (self.preview_btn, self.synthesize_btn, self.refresh_btn):
+            button.setEnabled(ready)
+
+    def warm_up(self, progress):
+        """Render a short sentence with the first voice. Runs on the synthesis worker."""
+        weights = np.zeros(len(self.blender.names), dtype=np.float32)
+        weights[0] = 1.0
+        timer = StageTimer("warm_up")
+        samples, sr = self.synthesize(WARM_UP_TEXT, self.blender.blend(weights), 1.0, timer=timer)
+        return timer, samples, sr
+
+    def open_session_settings(self):
+        self.session_dialog = SessionSettingsDialog(self.session_settings, self.start_thread_sweep, self)
+        accepted = self.session_dialog.exec_() == QDialog.Accepted
+        settings = self.session_dialog.settings()
+        self.session_dialog = None
+        if not accepted or settings == self.session_settings:
+            return
+        try:
+            write_session_settings(self.session_settings_path, settings)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save session settings: {str(e)}")
+            return
+        self.session_settings = settings
+        with self.pipelines_lock:
+            self.pipelines.clear()
+        self.set_model_ready(False)
+        self.statusBar().showMessage("Reloading model...")
+        self.synthesis_worker.submit("load", self.load_model, priority=PRIORITY_INTERACTIVE)
+
+    def open_model_variants(self):
+        default_int8_path = os.path.join(self.cache_dir, "models", "kokoro.int8.onnx")
+        self.variants_dialog = ModelVariantsDialog(
+            self.variants, default_int8_path, self.start_quantize, self.start_variant_compare,
+            lambda samples, sr: self.player.play(samples, sr), self
+        )
+        accepted = self.variants_dialog.exec_() == QDialog.Accepted
+        paths, roles = self.variants_dialog.paths(), self.variants_dialog.roles()
+        self.variants_dialog = None
+        if accepted:
+            preview_model = self.variants.model_path("preview")
+            self.variants.paths, self.variants.roles = paths, roles
+            try:
+                self.variants.save()
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to save model variants: {str(e)}")
+            self.invalidate_speculation()
+            if self.variants.model_path("preview") != preview_model:
+                self.set_model_ready(False)
+                self.statusBar().showMessage(f"Loading {roles['preview']} model...")
+                self.synthesis_worker.submit("load", self.load_model, priority=PRIORITY_INTERACTIVE)
+        self.release_unused_pipelines()
+
+    def start_quantize(self, source, output):
+        self.synthesis_worker.submit("quantize", lambda progress: quantize_model(source, output), priority=PRIORITY_INTERACTIVE)
+
+    def start_variant_compare(self, path_a, path_b):
+        text = self.text_input.toPlainText().strip() or WARM_UP_TEXT
+        if self.pipeline is None:
+            self.variants_dialog.finish_compare(error="model still loading")
+            return
+        slider_values = self.current_slider_values()
+        if not slider_values.any():
+            slider_values = np.eye(len(slider_values), dtype=int)[0] * 100
+        voice_blend = self.blender.blend(scale_weights(slider_values, self.normalize_sliders))
+        phonemes = self.phoneme_cache.phonemes(text, "en-us")
+        speed = self.speed
+        self.synthesis_worker.submit(
+            "compare",
+            lambda progress: compare_pipelines(self.pipeline_for(path_a), self.pipeline_for(path_b), phonemes, voice_blend, speed),
+            priority=PRIORITY_INTERACTIVE
+        )
+
+    def start_thread_sweep(self, settings):
+        if self.pipeline is None:
+            self.session_dialog.finish_sweep({})
+            return
+        weights = np.zeros(len(self.blender.names), dtype=np.float32)
+        weights[0] = 1.0
+        voice = self.blender.blend(weights)
+        phonemes = self.phoneme_cache.phonemes(WARM_UP_TEXT, "en-us")
+        # Tune the model previews actually run on, which may be a quantized variant
+        model_path, voices_path = self.variants.model_path("preview"), self.voices_path
+        self.synthesis_worker.submit(
+            "sweep",
+            lambda progress: sweep_thread_counts(
+                model_path, voices_path, settings, voice, phonemes,
+                on_result=lambda threads, ms: progress((threads, ms))
+            ),
+            priority=PRIORITY_INTERACTIVE
+        )
+
+    def mark_window_shown(self):
+        self.startup_times["window_shown"] = time.perf_counter() - PROCESS_START
+
+    def log_startup_times(self):
+        times = {name: round(seconds * 1000) for name, seconds in self.startup_times.items()}
+        summary = ", ".join(f"{name} {ms} ms" for name, ms in times.items())
+        memory = ", ".join(f"{name} {mb} MB" for name, mb in self.startup_memory.items())
+        print(f"Startup: {summary}; {memory}")
+        self.statusBar().showMessage(f"Model ready ({summary}; {memory})")
+        # One line per launch; the first launch after boot is the cold start, later ones warm
+        try:
+            os.makedirs(self.config_dir, exist_ok=True)
+            with open(os.path.join(self.config_dir, "startup_times.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps({"timestamp": time.time(), **times, **self.startup_memory}) + "\n")
+        except Exception as e:
+            print(f"Failed to log startup times: {str(e)}")
+        self.timing_log.info(json.dumps(self.startup_timer.record(**times, **self.startup_memory)))
 
     def init_ui(self):
         # Main widget
@@ -112,17 +888,61 @@ class KokoroVoiceBlender(QMainWindow):
         text_layout.addWidget(QLabel("Text to Synthesize:"))
         self.text_input = QTextEdit()
         self.text_input.setText("Hello, this is a test for voice blending.")
+        self.text_input.textChanged.connect(self.refresh_pending_preview)
+        self.text_input.textChanged.connect(self.invalidate_speculation)
         text_layout.addWidget(self.text_input)
         splitter.addWidget(text_widget)
 
-        # Section 2: Sliders in scroll area
+        # Section 2: Preset list next to the sliders
+        section_splitter = QSplitter(Qt.Horizontal)
+        presets_widget = QWidget()
+        presets_layout = QVBoxLayout(presets_widget)
+        presets_layout.setContentsMargins(0, 0, 0, 0)
+        presets_layout.addWidget(QLabel("Presets:"))
+        self.preset_filter_input = QLineEdit()
+        self.preset_filter_input.setPlaceholderText("Search name or voice")
+        self.preset_filter_input.setClearButtonEnabled(True)
+        self.preset_filter_input.textChanged.connect(self.update_preset_list)
+        presets_layout.addWidget(self.preset_filter_input)
+        self.preset_list = QListWidget()
+        self.preset_list.setToolTip("Click to switch, double-click to switch and preview")
+        self.preset_list.itemClicked.connect(lambda item: self.apply_preset(item.text()))
+        self.preset_list.itemActivated.connect(lambda item: self.apply_preset(item.text(), preview=True))
+        presets_layout.addWidget(self.preset_list)
+
+        # Audition candidates below the presets, filled as their renders finish
+        presets_layout.addWidget(QLabel("Audition:"))
+        self.audition_list = QListWidget()
+        self.audition_list.setIconSize(QSize(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT))
+        self.audition_list.setToolTip("Click a candidate to apply its weights and hear it")
+        self.audition_list.itemClicked.connect(lambda item: self.apply_candidate(item.data(Qt.UserRole)))
+        presets_layout.addWidget(self.audition_list)
+        section_splitter.addWidget(presets_widget)
+
+        # Sliders in scroll area, filterable by voice name
+        sliders_widget = QWidget()
+        sliders_layout = QVBoxLayout(sliders_widget)
+        sliders_layout.setContentsMargins(0, 0, 0, 0)
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Filter Voices:"))
+        self.voice_filter_input = QLineEdit()
+        self.voice_filter_input.setPlaceholderText("e.g. af_ zm_ bella")
+        self.voice_filter_input.setClearButtonEnabled(True)
+        self.voice_filter_input.textChanged.connect(self.update_slider_layout)
+        filter_layout.addWidget(self.voice_filter_input)
+        sliders_layout.addLayout(filter_layout)
+
         self.scroll_widget = QWidget()
         self.scroll_layout = QGridLayout(self.scroll_widget)
+        self.scroll_layout.setAlignment(Qt.AlignTop)
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
         scroll_area.setWidget(self.scroll_widget)
         self.update_slider_layout()
-        splitter.addWidget(scroll_area)
+        sliders_layout.addWidget(scroll_area)
+        section_splitter.addWidget(sliders_widget)
+        section_splitter.setSizes([160, 640])
+        splitter.addWidget(section_splitter)
 
         # Section 3: Buttons and checkboxes
         button_widget = QWidget()
@@ -138,7 +958,15 @@ class KokoroVoiceBlender(QMainWindow):
         self.continuous_loop_cb.setEnabled(False)
         self.continuous_loop_cb.stateChanged.connect(self.toggle_continuous_loop)
         controls_layout.addWidget(self.continuous_loop_cb)
+
+        self.loop_crossfade_cb = QCheckBox("Crossfade Loop Changes")
+        self.loop_crossfade_cb.setEnabled(False)
+        controls_layout.addWidget(self.loop_crossfade_cb)
         
+        self.streaming_cb = QCheckBox("Streaming Preview")
+        self.streaming_cb.stateChanged.connect(self.toggle_streaming_preview)
+        controls_layout.addWidget(self.streaming_cb)
+
         self.normalize_cb = QCheckBox("Normalize Sliders to Sum 1")
         self.normalize_cb.setChecked(True)
         self.normalize_cb.stateChanged.connect(self.toggle_normalize_sliders)
@@ -155,6 +983,7 @@ class KokoroVoiceBlender(QMainWindow):
         self.random_voice_count_combo = QComboBox()
         self.random_voice_count_combo.addItems([str(i) for i in range(1, 21)])
         self.random_voice_count_combo.setCurrentText("10")
+        self.random_voice_count_combo.currentIndexChanged.connect(self.invalidate_speculation)
         controls_layout.addWidget(self.random_voice_count_combo)
         
         self.randomize_btn = QPushButton("Randomize")
@@ -164,6 +993,22 @@ class KokoroVoiceBlender(QMainWindow):
         self.refresh_btn = QPushButton("Refresh")
         self.refresh_btn.clicked.connect(self.refresh_voices)
         controls_layout.addWidget(self.refresh_btn)
+
+        self.audition_btn = QPushButton("Audition")
+        self.audition_btn.setToolTip("Render several random blends of the current text at once, using the Workers setting")
+        self.audition_btn.clicked.connect(self.audition_voices)
+        controls_layout.addWidget(self.audition_btn)
+        self.audition_count_spinbox = QSpinBox()
+        self.audition_count_spinbox.setRange(2, 16)
+        self.audition_count_spinbox.setValue(6)
+        self.audition_count_spinbox.setToolTip("Candidates per audition")
+        controls_layout.addWidget(self.audition_count_spinbox)
+
+        self.speculative_cb = QCheckBox("Pre-render")
+        self.speculative_cb.setToolTip("Render upcoming Randomize/Refresh blends in the background")
+        self.speculative_cb.setChecked(True)
+        self.speculative_cb.stateChanged.connect(self.invalidate_speculation)
+        controls_layout.addWidget(self.speculative_cb)
         
         controls_layout.addWidget(QLabel("Speed:"))
         self.speed_spinbox = QDoubleSpinBox()
@@ -186,9 +1031,26 @@ class KokoroVoiceBlender(QMainWindow):
         self.save_config_btn.clicked.connect(self.save_config)
         extra_buttons_layout.addWidget(self.save_config_btn)
 
+        self.store_blend_cb = QCheckBox("Store Blend")
+        self.store_blend_cb.setToolTip("Also save the blended voice next to the config, so loading it skips blending")
+        extra_buttons_layout.addWidget(self.store_blend_cb)
+
         self.load_config_btn = QPushButton("Load Config")
         self.load_config_btn.clicked.connect(self.load_config)
         extra_buttons_layout.addWidget(self.load_config_btn)
+
+        self.export_voice_btn = QPushButton("Export Voice...")
+        self.export_voice_btn.setToolTip(f"Add the current blend as a named voice to {self.custom_voices_path}")
+        self.export_voice_btn.clicked.connect(self.export_voice)
+        extra_buttons_layout.addWidget(self.export_voice_btn)
+
+        self.session_settings_btn = QPushButton("Session Settings...")
+        self.session_settings_btn.clicked.connect(self.open_session_settings)
+        extra_buttons_layout.addWidget(self.session_settings_btn)
+
+        self.model_variants_btn = QPushButton("Model Variants...")
+        self.model_variants_btn.clicked.connect(self.open_model_variants)
+        extra_buttons_layout.addWidget(self.model_variants_btn)
         extra_buttons_layout.addStretch()
         button_layout.addLayout(extra_buttons_layout)
 
@@ -201,249 +1063,362 @@ class KokoroVoiceBlender(QMainWindow):
         self.synthesize_btn = QPushButton("Synthesize and Save")
         self.synthesize_btn.clicked.connect(self.synthesize_and_save)
         buttons_layout.addWidget(self.synthesize_btn)
+
+        self.play_after_save_cb = QCheckBox("Play After Saving")
+        buttons_layout.addWidget(self.play_after_save_cb)
         button_layout.addLayout(buttons_layout)
+
+        # Long-form synthesis: chunks rendered in parallel and joined in order
+        long_form_layout = QHBoxLayout()
+        self.long_form_cb = QCheckBox("Long-Form (Parallel Chunks)")
+        long_form_layout.addWidget(self.long_form_cb)
+
+        long_form_layout.addWidget(QLabel("Workers:"))
+        self.chunk_workers_spinbox = QSpinBox()
+        self.chunk_workers_spinbox.setRange(1, os.cpu_count() or 1)
+        self.chunk_workers_spinbox.setValue(max(1, (os.cpu_count() or 1) // 2))
+        long_form_layout.addWidget(self.chunk_workers_spinbox)
+
+        long_form_layout.addWidget(QLabel("Chunk Gap (ms):"))
+        self.chunk_gap_spinbox = QSpinBox()
+        self.chunk_gap_spinbox.setRange(0, 2000)
+        self.chunk_gap_spinbox.setValue(int(SENTENCE_PAUSE * 1000))
+        long_form_layout.addWidget(self.chunk_gap_spinbox)
+
+        self.crossfade_cb = QCheckBox("Crossfade Instead of Gap")
+        long_form_layout.addWidget(self.crossfade_cb)
+        long_form_layout.addStretch()
+
+        self.profile_cb = QCheckBox("Profile Next Render")
+        self.profile_cb.setToolTip("Run the next preview or save under cProfile; stats go to configs/profiles/")
+        long_form_layout.addWidget(self.profile_cb)
+        button_layout.addLayout(long_form_layout)
+
+        # Save progress, shown while Synthesize and Save runs
+        progress_layout = QHBoxLayout()
+        self.save_progress = QProgressBar()
+        self.save_progress.setFormat("%v / %m chunks")
+        self.save_progress.setVisible(False)
+        progress_layout.addWidget(self.save_progress)
+        self.cancel_save_btn = QPushButton("Cancel")
+        self.cancel_save_btn.clicked.connect(self.cancel_save)
+        self.cancel_save_btn.setVisible(False)
+        progress_layout.addWidget(self.cancel_save_btn)
+        button_layout.addLayout(progress_layout)
         splitter.addWidget(button_widget)
 
         # Set initial sizes
         splitter.setSizes([100, 400, 100])
 
+        # Status bar
+        self.timing_label = QLabel()
+        self.statusBar().addPermanentWidget(self.timing_label)
+        self.cache_status_label = QLabel()
+        self.statusBar().addPermanentWidget(self.cache_status_label)
+        self.update_cache_status()
+
     def update_speed(self, value):
         self.speed = value
+        self.invalidate_speculation()
 
     def toggle_normalize_sliders(self, state):
         self.normalize_sliders = state == Qt.Checked
+        self.invalidate_speculation()
         if self.normalize_sliders:
             self.adjust_sliders_to_sum_one(None)
         self.update_labels()
 
     def slider_value_changed(self, voice, value):
         if not self.adjusting:
+            self.weight_model.values[self.voice_index[voice]] = value
             self.pending_voice = voice
             self.pending_value = value
+            self.pending_indices.add(self.voice_index[voice])
             self.debounce_timer.start(100)  # 100 ms Verzögerung
 
     def process_debounced_slider_change(self):
         if self.pending_voice is not None:
+            stale = self.pending_indices
             if self.normalize_sliders:
-                self.adjust_sliders_to_sum_one(self.pending_voice)
-            else:
-                self.update_labels()
+                # Sliders moved earlier in the window may be outside the rebalanced set
+                stale = stale.difference(self.adjust_sliders_to_sum_one(self.pending_voice))
+            if stale:
+                self.update_labels(sorted(stale))
             self.pending_voice = None
             self.pending_value = None
+            self.pending_indices.clear()
 
     def adjust_sliders_to_sum_one(self, changed_voice):
+        """Rebalance the sliders to sum to 100; returns the indices whose value or label was updated."""
         if not self.normalize_sliders or self.adjusting:
-            return
-        
+            return []
+
         self.adjusting = True
-        
-        # Get current normalized values (0-1)
-        voice_ratios = {voice: slider.value() / 100 for voice, slider in self.sliders.items()}
-        total = sum(voice_ratios.values())
-        
-        if total == 0:
-            self.adjusting = False
-            return
-        
-        # Store new values to apply later
-        new_values = {}
-        
         if changed_voice:
-            # Get the new value of the changed slider
-            target_value = voice_ratios[changed_voice]
-            
-            # Identify active voices (value > 0, excluding changed voice)
-            active_voices = [(voice, value) for voice, value in voice_ratios.items() if voice != changed_voice and value > 0]
-            remaining_sum = sum(value for _, value in active_voices)
-            
-            if remaining_sum == 0:
-                for voice in self.voices:
-                    if voice != changed_voice:
-                        new_values[voice] = 0
-                new_values[changed_voice] = min(1.0, target_value)
-            else:
-                # Calculate the remaining weight to distribute
-                remaining_weight = 1 - target_value
-                
-                if remaining_weight < 0:
-                    new_values[changed_voice] = 1.0
-                    for voice in self.voices:
-                        if voice != changed_voice:
-                            new_values[voice] = 0
-                else:
-                    # Store new values proportionally
-                    new_values[changed_voice] = target_value
-                    for voice, current_value in active_voices:
-                        proportion = current_value / remaining_sum
-                        new_value = remaining_weight * proportion
-                        new_values[voice] = new_value
-                    
-                    # Adjust the last active voice to ensure sum is exactly 1
-                    active_voices_keys = [v for v, _ in active_voices]
-                    if active_voices_keys:
-                        last_voice = active_voices_keys[-1]
-                        current_sum = sum(new_values.get(v, 0) for v in self.voices)
-                        adjustment = 1 - current_sum
-                        new_values[last_voice] = new_values[last_voice] + adjustment
+            # Keep the changed voice and share the rest among the other active voices
+            index = self.voice_index[changed_voice]
+            changed = np.union1d(self.weight_model.rebalance(index), [index])
         else:
             # Scale all voices to sum to 1
-            scale_factor = 1 / total if total > 0 else 0
-            for voice in self.voices:
-                new_value = voice_ratios[voice] * scale_factor
-                new_values[voice] = new_value
-            
-            # Adjust the last non-zero voice to ensure sum is exactly 1
-            non_zero_voices = [v for v, r in voice_ratios.items() if r > 0]
-            if non_zero_voices:
-                last_voice = non_zero_voices[-1]
-                current_sum = sum(new_values.get(v, 0) for v in self.voices)
-                adjustment = 1 - current_sum
-                new_values[last_voice] = new_values[last_voice] + adjustment
-        
-        # Apply new values with signals blocked
-        for voice in self.voices:
-            new_value = new_values.get(voice, 0)
-            slider_value = max(0, min(100, round(new_value * 100)))
-            self.sliders[voice].blockSignals(True)
-            self.sliders[voice].setValue(slider_value)
-            self.sliders[voice].blockSignals(False)
-        
+            changed = self.weight_model.normalize()
+        self.push_slider_values(changed)
         self.adjusting = False
-        self.update_labels()
+        self.update_labels(changed)
+        return changed
 
-    def update_slider_layout(self):
-        # Save current slider values
-        current_values = {voice: slider.value() for voice, slider in self.sliders.items()}
-
-        # Clear existing layout
-        for i in reversed(range(self.scroll_layout.count())):
-            item = self.scroll_layout.itemAt(i)
-            if item.layout():
-                layout = item.layout()
-                for j in reversed(range(layout.count())):
-                    widget = layout.itemAt(j).widget()
-                    if widget:
-                        widget.setParent(None)
-                layout.setParent(None)
-            elif item.widget():
-                item.widget().setParent(None)
-
-        # Reset sliders and labels dictionaries
-        self.sliders = {}
-        self.labels = {}
+    def push_slider_values(self, indices):
+        """Copy model values to the given sliders with signals blocked."""
+        for i in indices:
+            slider = self.sliders[self.voices[i]]
+            slider.blockSignals(True)
+            slider.setValue(int(self.weight_model.values[i]))
+            slider.blockSignals(False)
 
-        # Add sliders in grid layout
+    def set_slider_values(self, values):
+        """Replace the slider state, touching only the widgets whose value changes."""
+        values = np.array(values, dtype=int)
+        values[self.missing_indices] = 0
+        changed = self.weight_model.assign(values)
+        self.push_slider_values(changed)
+        self.update_labels(changed)
+
+    def build_slider_rows(self):
+        """Create one label + slider row per voice; every later reflow reuses them."""
         for idx, voice in enumerate(self.voices):
-            row = idx // self.columns
-            col = idx % self.columns
-            slider_layout = QHBoxLayout()
-            label = QLabel(f"{voice}: 0.0")
+            row_widget = QWidget()
+            slider_layout = QHBoxLayout(row_widget)
+            slider_layout.setContentsMargins(0, 0, 0, 0)
+            label = QLabel(f"{voice}: {self.weight_model.values[idx] / 100:.2f}")
             slider_layout.addWidget(label)
             slider = CustomSlider(Qt.Horizontal)
             slider.setRange(0, 100)
-            slider.setValue(current_values.get(voice, 0))  # Restore saved value
+            slider.setValue(int(self.weight_model.values[idx]))
             slider.setTracking(True)
             slider.setSingleStep(1)
             slider.valueChanged.connect(lambda value, v=voice: self.slider_value_changed(v, value))
             slider_layout.addWidget(slider)
             self.sliders[voice] = slider
             self.labels[voice] = label
-            self.scroll_layout.addLayout(slider_layout, row, col)
+            self.slider_rows[voice] = row_widget
 
-        if self.normalize_sliders:
-            self.adjust_sliders_to_sum_one(None)
-        self.update_labels()
+    def update_slider_layout(self):
+        """Move the rows of the voices matching the filter to their grid positions."""
+        if not self.slider_rows:
+            self.build_slider_rows()
+
+        voice_filter = self.voice_filter_input.text()
+        tokens = [token for token in voice_filter.replace(",", " ").lower().split() if token]
+        visible = [voice for voice in self.voices if not tokens or any(token in voice for token in tokens)]
+
+        self.scroll_widget.setUpdatesEnabled(False)
+        for row_widget in self.slider_rows.values():
+            self.scroll_layout.removeWidget(row_widget)
+            row_widget.setVisible(False)
+        for idx, voice in enumerate(visible):
+            self.scroll_layout.addWidget(self.slider_rows[voice], idx // self.columns, idx % self.columns)
+            self.slider_rows[voice].setVisible(True)
+        self.scroll_widget.setUpdatesEnabled(True)
 
     def change_columns(self):
         self.columns = int(self.columns_combo.currentText())
         self.update_slider_layout()
 
     def reset_sliders(self):
-        for slider in self.sliders.values():
-            slider.blockSignals(True)
-            slider.setValue(0)
-            slider.blockSignals(False)
-        self.update_labels()
+        self.set_slider_values(np.zeros(len(self.voices), dtype=int))
 
     def randomize_voices(self):
-        # Get number of voices to randomize
-        num_voices = int(self.random_voice_count_combo.currentText())
-        num_voices = min(num_voices, len(self.voices))  # Ensure not more than available voices
-
-        # Randomly select voices
-        selected_voices = random.sample(self.voices, num_voices)
-
-        # Generate random weights
-        if self.normalize_sliders:
-            # Use Dirichlet distribution for weights summing to 1
-            weights = np.random.dirichlet(np.ones(num_voices))
-        else:
-            # Generate raw weights between 0.01 and 1.00
-            weights = np.random.uniform(0.01, 1.00, num_voices)
-
-        # Assign weights to sliders
-        for voice in self.voices:
-            self.sliders[voice].blockSignals(True)
-            if voice in selected_voices:
-                idx = selected_voices.index(voice)
-                slider_value = max(1, min(100, round(weights[idx] * 100)))
-                self.sliders[voice].setValue(slider_value)
-            else:
-                self.sliders[voice].setValue(0)
-            self.sliders[voice].blockSignals(False)
-
-        if self.normalize_sliders:
-            self.adjust_sliders_to_sum_one(None)
-        self.update_labels()
+        # Take a pre-rendered blend if one is ready, otherwise draw a new one
+        values = self.take_speculative_blend("randomize")
+        if values is None:
+            num_voices = int(self.random_voice_count_combo.currentText())
+            values = draw_random_values(len(self.voices), count=num_voices, normalize=self.normalize_sliders)
+        self.set_slider_values(values)
+        self.schedule_speculation()
 
     def refresh_voices(self):
         # Get currently active voices (value > 0)
-        active_voices = [voice for voice, slider in self.sliders.items() if slider.value() > 0]
-        if not active_voices:
+        active = self.active_voice_indices()
+        if not active:
             QMessageBox.warning(self, "Warning", "No active voices to refresh. Please randomize or set voices first.")
             return
 
-        # Generate new random weights for active voices
-        num_voices = len(active_voices)
-        if self.normalize_sliders:
-            # Use Dirichlet distribution for weights summing to 1
-            weights = np.random.dirichlet(np.ones(num_voices))
-        else:
-            # Generate raw weights between 0.01 and 1.00
-            weights = np.random.uniform(0.01, 1.00, num_voices)
-
-        # Assign new weights to active voices
-        for voice in self.voices:
-            self.sliders[voice].blockSignals(True)
-            if voice in active_voices:
-                idx = active_voices.index(voice)
-                slider_value = max(1, min(100, round(weights[idx] * 100)))
-                self.sliders[voice].setValue(slider_value)
-            self.sliders[voice].blockSignals(False)
-
-        if self.normalize_sliders:
-            self.adjust_sliders_to_sum_one(None)
-        self.update_labels()
+        # New random weights for the active voices
+        values = self.take_speculative_blend("refresh")
+        if values is None:
+            values = draw_random_values(len(self.voices), active=active, normalize=self.normalize_sliders)
+        self.set_slider_values(values)
+        self.schedule_speculation()
 
-        # Play the new blend
+        # Play the new blend (instantly when it was pre-rendered)
         self.preview_blend()
 
-    def save_config(self):
-        # Ensure config directory exists
-        os.makedirs(self.config_dir, exist_ok=True)
+    def audition_voices(self):
+        """Draw K random blends and render them concurrently; each shows up on the board when done."""
+        if self.pipeline is None:
+            return  # Model still loading
+        text = self.text_input.toPlainText().strip()
+        if not text:
+            QMessageBox.critical(self, "Error", "Please enter text to synthesize.")
+            return
 
+        num_voices = int(self.random_voice_count_combo.currentText())
+        candidates = [
+            draw_random_values(len(self.voices), count=num_voices, normalize=self.normalize_sliders)
+            for _ in range(self.audition_count_spinbox.value())
+        ]
+        # One blend call for all candidates
+        styles = self.blender.blend_batch(scale_weights(np.stack(candidates)[:, self.blend_columns], self.normalize_sliders))
+        keys = [self.text_keys(text, values=values) for values in candidates]
+        speed = self.speed
+        workers = self.chunk_workers_spinbox.value()
+
+        def job(progress):
+            superseded = threading.Event()
+
+            def render(index):
+                # Rendered through the synthesis cache, so previewing an applied candidate is instant
+                samples, sr = self.render_text(keys[index], styles[index], speed)
+                if not progress((index, samples, sr)):
+                    superseded.set()
+                return samples, sr
+
+            started = time.perf_counter()
+            results = render_chunks(render, range(len(candidates)), workers, on_chunk=lambda done, total: not superseded.is_set())
+            return None if results is None else time.perf_counter() - started
+
+        self.audition_candidates = [{"values": values, "audio": None} for values in candidates]
+        self.audition_list.clear()
+        for index, values in enumerate(candidates):
+            item = QListWidgetItem(f"{index + 1}. rendering...")
+            item.setData(Qt.UserRole, index)
+            item.setToolTip(self.describe_values(values))
+            self.audition_list.addItem(item)
+        self.synthesis_worker.submit("audition", job, priority=PRIORITY_NORMAL, context={"count": len(candidates)})
+
+    def describe_values(self, values):
+        """Voices of a blend with their weights, heaviest first."""
+        order = np.argsort(values)[::-1]
+        return ", ".join(f"{self.voices[i]} {values[i] / 100:.2f}" for i in order if values[i] > 0)
+
+    def show_candidate(self, index, samples, sr):
+        candidate = self.audition_candidates[index]
+        candidate["audio"] = (samples, sr)
+        item = self.audition_list.item(index)
+        item.setIcon(QIcon(waveform_pixmap(samples)))
+        item.setText(f"{index + 1}. {self.describe_values(candidate['values'])}")
+
+    def apply_candidate(self, index):
+        """Put a candidate's weights on the sliders and play it once it is rendered."""
+        if index is None or index >= len(self.audition_candidates):
+            return
+        candidate = self.audition_candidates[index]
+        self.set_slider_values(candidate["values"])
+        if candidate["audio"] is not None:
+            self.synthesis_worker.cancel("preview")
+            self.play_preview(*candidate["audio"])
+
+    def active_voice_indices(self):
+        return tuple(self.weight_model.active())
+
+    def take_speculative_blend(self, kind):
+        if not self.speculative_cb.isChecked():
+            return None
+        if kind == "refresh" and self.speculative_active != self.active_voice_indices():
+            return None
+        buffer = self.speculative_blends[kind]
+        return buffer.popleft() if buffer else None
+
+    def invalidate_speculation(self):
+        """Drop buffered blends after a change to text, speed, voice count or normalization."""
+        for buffer in self.speculative_blends.values():
+            buffer.clear()
+        self.speculated_keys.clear()
+        self.synthesis_worker.cancel("speculate")
+        self.schedule_speculation()
+
+    def schedule_speculation(self):
+        # Wait for typing or clicking to settle before starting background renders
+        if self.speculative_cb.isChecked():
+            self.speculate_timer.start(500)
+
+    def fill_speculative_blends(self):
+        num_voices = int(self.random_voice_count_combo.currentText())
+        randomize = self.speculative_blends["randomize"]
+        while len(randomize) < SPECULATIVE_DEPTH:
+            randomize.append(draw_random_values(len(self.voices), count=num_voices, normalize=self.normalize_sliders))
+
+        active = self.active_voice_indices()
+        refresh = self.speculative_blends["refresh"]
+        if active != self.speculative_active:
+            refresh.clear()
+            self.speculative_active = active
+        while active and len(refresh) < SPECULATIVE_DEPTH:
+            refresh.append(draw_random_values(len(self.voices), active=active, normalize=self.normalize_sliders))
+
+    def speculate(self):
+        """Render the next buffered random blend that is not cached yet, at background priority."""
+        if not self.speculative_cb.isChecked() or self.pipeline is None:
+            return
+        if self.synthesis_worker.is_busy("speculate"):
+            return
+        text = self.text_input.toPlainText().strip()
+        if not text:
+            return
+        self.fill_speculative_blends()
+        # Refresh blends first: Refresh plays its blend right away
+        for kind in ("refresh", "randomize"):
+            for values in self.speculative_blends[kind]:
+                keys = self.text_keys(text, values=values)
+                if keys[0] in self.speculated_keys:
+                    continue
+                weights = scale_weights(self.blender.weight_vector(dict(zip(self.voices, values))), self.normalize_sliders)
+                voice_blend = self.blender.blend(weights)
+                speed = self.speed
+                self.synthesis_worker.submit(
+                    "speculate",
+                    lambda progress: self.render_text(keys, voice_blend, speed),
+                    priority=PRIORITY_BACKGROUND,
+                    context={"key": keys[0]}
+                )
+                return
+
+    def current_config(self):
         # Get normalized weights
-        voice_ratios = {voice: slider.value() / 100 for voice, slider in self.sliders.items()}
-
-        # Prepare config
-        config = {
+        voice_ratios = {voice: int(value) / 100 for voice, value in zip(self.voices, self.weight_model.values)}
+        return {
             "voice_weights": voice_ratios,
-            "voice_enabled": {voice: slider.value() > 0 for voice, slider in self.sliders.items()},
+            "voice_enabled": {voice: bool(value > 0) for voice, value in zip(self.voices, self.weight_model.values)},
             "normalize_sliders": self.normalize_sliders,
             "sliders_per_row": self.columns,
             "speed": self.speed
         }
 
+    def apply_config(self, config):
+        voice_weights = config.get("voice_weights", {})
+        # Scale normalized weights (0-1) to slider range (0-100)
+        self.set_slider_values([round(voice_weights.get(voice, 0) * 100) for voice in self.voices])
+
+        # Load normalize_sliders setting
+        self.normalize_sliders = config.get("normalize_sliders", True)
+        self.normalize_cb.setChecked(self.normalize_sliders)
+
+        # Load sliders_per_row setting
+        self.columns = config.get("sliders_per_row", 1)
+        self.columns_combo.setCurrentText(str(self.columns))
+
+        # Load speed setting
+        self.speed = config.get("speed", 1.0)
+        self.speed_spinbox.setValue(self.speed)
+
+        # The grid reflows through change_columns when the column count changes
+        if self.normalize_sliders:
+            self.adjust_sliders_to_sum_one(None)
+
+    def save_config(self):
+        # Ensure config directory exists
+        os.makedirs(self.config_dir, exist_ok=True)
+        config = self.current_config()
+
         # Open file dialog with automatic .json suffix
         file_dialog = QFileDialog(self, "Save Configuration", self.config_dir, "JSON Files (*.json)")
         file_dialog.setDefaultSuffix("json")
@@ -451,12 +1426,56 @@ class KokoroVoiceBlender(QMainWindow):
         if file_dialog.exec_():
             file_path = file_dialog.selectedFiles()[0]
             try:
+                # The sidecar goes first, so a watcher reacting to the config finds it
+                self.save_blend_sidecar(file_path, config)
                 with open(file_path, "w", encoding="utf-8") as f:
                     json.dump(config, f, indent=4)
                 QMessageBox.information(self, "Success", f"Configuration saved to {file_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to save configuration: {str(e)}")
 
+    def save_blend_sidecar(self, config_path, config):
+        """Write the config's blended voice next to it, or remove an old one when Store Blend is off."""
+        slider_values = self.current_slider_values() if self.blender is not None else None
+        if not self.store_blend_cb.isChecked() or slider_values is None or not slider_values.any():
+            if os.path.exists(blend_sidecar_path(config_path)):
+                os.remove(blend_sidecar_path(config_path))
+            return
+        write_blend_sidecar(config_path, config, self.blend(slider_values), file_checksum(self.voices_path))
+
+    def load_blend_sidecar(self, config_path, config):
+        """Use a valid stored blend of a loaded config for its previews instead of blending."""
+        if self.blender is None:
+            return
+        style = read_blend_sidecar(config_path, config, file_checksum(self.voices_path))
+        if style is not None:
+            self.config_library.remember_blend(self.current_slider_values(), self.normalize_sliders, style)
+
+    def export_voice(self):
+        """Add the current blend to the custom voices pack under a name kokoro_onnx can load."""
+        if self.blender is None:
+            return  # Model still loading
+        slider_values = self.current_slider_values()
+        if not slider_values.any():
+            QMessageBox.critical(self, "Error", "At least one voice ratio must be greater than 0.")
+            return
+        current = self.preset_list.currentItem()
+        name, ok = QInputDialog.getText(
+            self, "Export Voice", f"Voice name in {self.custom_voices_path}:",
+            text=current.text() if current is not None else ""
+        )
+        name = name.strip()
+        if not ok or not name:
+            return
+        try:
+            names = export_voices(self.custom_voices_path, {name: self.blend(slider_values)})
+            QMessageBox.information(
+                self, "Success",
+                f"Voice '{name}' exported to {self.custom_voices_path} ({len(names)} voices). Load the pack as voices_path and use voice=\"{name}\"."
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export voice: {str(e)}")
+
     def load_config(self):
         # Open file dialog
         file_path, _ = QFileDialog.getOpenFileName(
@@ -467,34 +1486,8 @@ class KokoroVoiceBlender(QMainWindow):
                 with open(file_path, "r", encoding="utf-8") as f:
                     config = json.load(f)
                 
-                voice_weights = config.get("voice_weights", {})
-                for voice in self.voices:
-                    if voice in voice_weights:
-                        # Scale normalized weights (0-1) to slider range (0-100)
-                        self.sliders[voice].blockSignals(True)
-                        self.sliders[voice].setValue(int(voice_weights[voice] * 100))
-                        self.sliders[voice].blockSignals(False)
-                    else:
-                        self.sliders[voice].blockSignals(True)
-                        self.sliders[voice].setValue(0)
-                        self.sliders[voice].blockSignals(False)
-                
-                # Load normalize_sliders setting
-                self.normalize_sliders = config.get("normalize_sliders", True)
-                self.normalize_cb.setChecked(self.normalize_sliders)
-                
-                # Load sliders_per_row setting
-                self.columns = config.get("sliders_per_row", 1)
-                self.columns_combo.setCurrentText(str(self.columns))
-                
-                # Load speed setting
-                self.speed = config.get("speed", 1.0)
-                self.speed_spinbox.setValue(self.speed)
-                
-                if self.normalize_sliders:
-                    self.adjust_sliders_to_sum_one(None)
-                self.update_slider_layout()
-                self.update_labels()
+                self.apply_config(config)
+                self.load_blend_sidecar(file_path, config)
                 QMessageBox.information(self, "Success", f"Configuration loaded from {file_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to load configuration: {str(e)}")
@@ -505,148 +1498,357 @@ class KokoroVoiceBlender(QMainWindow):
                 with open(self.last_config_path, "r", encoding="utf-8") as f:
                     config = json.load(f)
                 
-                voice_weights = config.get("voice_weights", {})
-                for voice in self.voices:
-                    if voice in voice_weights:
-                        self.sliders[voice].blockSignals(True)
-                        self.sliders[voice].setValue(int(voice_weights[voice] * 100))
-                        self.sliders[voice].blockSignals(False)
-                    else:
-                        self.sliders[voice].blockSignals(True)
-                        self.sliders[voice].setValue(0)
-                        self.sliders[voice].blockSignals(False)
-                
-                # Load normalize_sliders setting
-                self.normalize_sliders = config.get("normalize_sliders", True)
-                self.normalize_cb.setChecked(self.normalize_sliders)
-                
-                # Load sliders_per_row setting
-                self.columns = config.get("sliders_per_row", 1)
-                self.columns_combo.setCurrentText(str(self.columns))
-                
-                # Load speed setting
-                self.speed = config.get("speed", 1.0)
-                self.speed_spinbox.setValue(self.speed)
-                
-                if self.normalize_sliders:
-                    self.adjust_sliders_to_sum_one(None)
-                self.update_slider_layout()
-                self.update_labels()
+                self.apply_config(config)
             except Exception as e:
                 print(f"Failed to load last configuration: {str(e)}")
 
+    def schedule_preset_refresh(self):
+        # Saves arrive as bursts of events (truncate, write, rename); index once they settle
+        self.preset_timer.start(200)
+
+    def refresh_presets(self):
+        """Re-index changed config files, then update the list, the watcher and the precomputed blends."""
+        changed = self.config_library.refresh()
+        watched = set(self.config_watcher.directories() + self.config_watcher.files())
+        paths = [self.config_dir] + [self.config_library.preset(name)["path"] for name in self.config_library.names()]
+        # Replaced files drop out of the watcher, so they are added again here
+        missing = [path for path in paths if path not in watched and os.path.exists(path)]
+        if missing:
+            self.config_watcher.addPaths(missing)
+        if changed:
+            self.update_preset_list()
+            self.precompute_preset_blends()
+
+    def update_preset_list(self):
+        names = self.config_library.search(self.preset_filter_input.text())
+        current = self.preset_list.currentItem()
+        current = current.text() if current is not None else None
+        self.preset_list.clear()
+        self.preset_list.addItems(names)
+        if current in names:
+            self.preset_list.setCurrentRow(names.index(current))
+
+    def precompute_preset_blends(self):
+        if self.blender is None:
+            return  # on_model_loaded starts it
+        blender, voices_path = self.blender, self.voices_path
+        # Presets saved with their blend load it from the sidecar instead of blending
+        self.synthesis_worker.submit(
+            "presets", lambda progress: self.config_library.precompute(blender, file_checksum(voices_path)),
+            priority=PRIORITY_BACKGROUND
+        )
+
+    def apply_preset(self, name, preview=False):
+        """Switch to an indexed preset without reading or parsing its file."""
+        preset = self.config_library.preset(name)
+        if preset is None:
+            return
+        self.apply_config(preset["config"])
+        self.statusBar().showMessage(f"Preset: {name}")
+        if preview:
+            self.preview_blend()
+
     def closeEvent(self, event):
         # Save current configuration as last_blender_config.json
         os.makedirs(self.config_dir, exist_ok=True)
-        voice_ratios = {voice: slider.value() / 100 for voice, slider in self.sliders.items()}
-        config = {
-            "voice_weights": voice_ratios,
-            "voice_enabled": {voice: slider.value() > 0 for voice, slider in self.sliders.items()},
-            "normalize_sliders": self.normalize_sliders,
-            "sliders_per_row": self.columns,
-            "speed": self.speed
-        }
+        config = self.current_config()
         try:
             with open(self.last_config_path, "w", encoding="utf-8") as f:
                 json.dump(config, f, indent=4)
         except Exception as e:
             print(f"Failed to save last configuration: {str(e)}")
-        
+
+        self.synthesis_worker.stop()
+        self.player.stop()
         super().closeEvent(event)
 
-    def update_labels(self):
-        # Get normalized values (0-1)
-        voice_ratios = {voice: slider.value() / 100 for voice, slider in self.sliders.items()}
-        
-        # Update labels with normalized values
-        for voice, slider in self.sliders.items():
-            norm_value = slider.value() / 100
-            self.labels[voice].setText(f"{voice}: {norm_value:.2f}")
+    def update_labels(self, indices=None):
+        # Update labels with normalized values (all of them when no indices are given)
+        if indices is None:
+            indices = range(len(self.voices))
+        for i in indices:
+            voice = self.voices[i]
+            self.labels[voice].setText(f"{voice}: {self.weight_model.values[i] / 100:.2f}")
 
         # Mark sliders as changed for auto-loop
         self.slider_changed = True
+        self.refresh_pending_preview()
+        if self.auto_loop:
+            self.loop_timer.start(150)
+
+    def refresh_pending_preview(self):
+        # A preview still rendering an outdated blend or text is superseded
+        if self.synthesis_worker.is_busy("preview"):
+            self.synthesis_worker.cancel("preview")
+            # Mid-edit the text or sliders may be empty for a moment; that just drops the preview
+            self.preview_blend(auto_loop=self.preview_is_auto_loop, quiet=True)
 
     def toggle_auto_loop(self, state):
         self.auto_loop = state == Qt.Checked
         self.continuous_loop_cb.setEnabled(self.auto_loop)
+        self.loop_crossfade_cb.setEnabled(self.auto_loop)
         if self.auto_loop:
             self.slider_changed = True
-            self.loop_timer.start(2000)  # 2 seconds for full playback
+            self.run_auto_loop()
         else:
             self.continuous_loop_cb.setChecked(False)
             self.continuous_loop = False
             self.loop_timer.stop()
-            pygame.mixer.quit()
+            self.player.stop()
 
     def toggle_continuous_loop(self, state):
         self.continuous_loop = state == Qt.Checked
+        self.player.set_loop_repeat(self.continuous_loop)
+        if self.continuous_loop and self.player.loop_samples is None:
+            # Nothing to repeat yet, render the current blend
+            self.slider_changed = True
+            self.run_auto_loop()
 
-    def run_auto_loop(self):
-        if not self.auto_loop or (not self.continuous_loop and not self.slider_changed):
-            return
+    def toggle_streaming_preview(self, state):
+        self.streaming_preview = state == Qt.Checked
 
-        # Wait for current playback to finish
-        if pygame.mixer.get_init() and pygame.mixer.music.get_busy():
+    def run_auto_loop(self):
+        # Render the changed blend right away; the player swaps it in at the next boundary
+        if not self.auto_loop or not self.slider_changed:
             return
-
-        # Run preview blend
-        self.preview_blend(auto_loop=True)
+        if self.synthesis_worker.is_busy("preview"):
+            return  # refresh_pending_preview already restarted it with the new blend
         self.slider_changed = False
+        self.preview_blend(auto_loop=True)
 
-    def preview_blend(self, auto_loop=False):
+    def preview_blend(self, auto_loop=False, quiet=False):
+        if self.pipeline is None:
+            return  # Model still loading
         text = self.text_input.toPlainText().strip()
         if not text:
-            if not auto_loop:
+            if not (auto_loop or quiet):
                 QMessageBox.critical(self, "Error", "Please enter text to synthesize.")
             return
 
-        # Get normalized values (0-1)
-        voice_ratios = {voice: slider.value() / 100 for voice, slider in self.sliders.items()}
-        active_voices = [(voice, ratio) for voice, ratio in voice_ratios.items() if ratio > 0]
+        # Get slider values (0-100), aligned with the blend matrix
+        slider_values = self.current_slider_values()
 
-        if not active_voices:
-            if not auto_loop:
+        if not slider_values.any():
+            if not (auto_loop or quiet):
                 QMessageBox.critical(self, "Error", "At least one voice ratio must be greater than 0.")
             return
 
-        # Calculate total sum of ratios
-        total = sum(ratio for _, ratio in active_voices)
-        if total == 0:
-            total = 1  # Prevent division by zero
-
-        # Scale ratios if normalization is disabled
-        scaled_voices = [(voice, ratio / total if not self.normalize_sliders else ratio) for voice, ratio in active_voices]
+        # Repeated blends play straight from the cache
+        timer = StageTimer("preview")
+        key = self.synthesis_key(text)
+        with timer.stage("cache"):
+            cached = self.synthesis_cache.get(key)
+        self.update_cache_status()
+        if cached is not None:
+            self.synthesis_worker.cancel("preview")
+            self.play_preview(*cached, auto_loop=auto_loop, timer=timer)
+            self.log_timing(timer, len(cached[0]) / cached[1], text_chars=len(text), cached=True, variant=self.variants.roles["preview"])
+            return
 
         # Create voice blending
-        try:
-            voice_blend = sum(
-                self.pipeline.voices[voice] * ratio
-                for voice, ratio in scaled_voices
-            )
-        except KeyError as e:
-            if not auto_loop:
-                QMessageBox.critical(self, "Error", f"Voice not found: {str(e)}")
-            return
+        with timer.stage("blend"):
+            voice_blend = self.blend(slider_values)
+
+        # Synthesize in the background; a newer preview supersedes this one. Sentences rendered
+        # before with this blend and speed come from the cache, so an edit only re-renders what it touched
+        speed = self.speed
+        keys = self.text_keys(text)
+        workers = self.chunk_workers_spinbox.value()
+        self.preview_is_auto_loop = auto_loop
+        context = {
+            "auto_loop": auto_loop, "started": time.perf_counter(), "timer": timer, "text_chars": len(text),
+            "variant": self.variants.roles["preview"]
+        }
+        # A loop that is already playing takes the new blend whole at the next boundary
+        if self.streaming_preview and not (auto_loop and self.player.is_busy()):
+            context["streamed"] = True
+            job = lambda progress: self.stream_preview(keys, voice_blend, speed, progress, timer)
+        else:
+            job = lambda progress: self.render_text(keys, voice_blend, speed, timer=timer, workers=workers, backfill=True)
+        job = self.profile_if_requested(job, "preview")
+        self.synthesis_worker.submit("preview", job, priority=PRIORITY_INTERACTIVE, context=context)
+
+    def profile_if_requested(self, job, kind):
+        """Run job under cProfile when "Profile Next Render" is checked, then clear the box."""
+        if not self.profile_cb.isChecked():
+            return job
+        self.profile_cb.setChecked(False)
+        path = os.path.join(self.config_dir, "profiles", f"{kind}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+        self.statusBar().showMessage(f"Profiling this {kind}; stats go to {path}")
+        return profile_job(job, path)
+
+    def log_timing(self, timer, audio_seconds, **extra):
+        """Show the stages of the last render in the status bar and append them to the timing log."""
+        record = timer.record(audio_seconds=audio_seconds, **{name: value for name, value in extra.items() if value is not None})
+        stages = ", ".join(f"{name} {ms:.0f}" if ms >= 10 else f"{name} {ms:.1f}" for name, ms in record["stages_ms"].items())
+        self.timing_label.setText(
+            f"Last {timer.kind}: {stages} ms | {record['audio_s']:.1f} s audio, RTF {record['rtf']:.2f}"
+        )
+        self.timing_log.info(json.dumps(record))
+
+    def stream_preview(self, keys, voice_blend, speed, progress, timer):
+        """Render sentence by sentence, handing every chunk to progress() as soon as it is ready.
+
+        Runs on the synthesis worker thread and stops once the job is superseded.
+        Sentences found in the synthesis cache are handed over whole; rendered
+        ones are stored there, and so is a stream that runs to the end.
+        """
+        key, _, sentences, sentence_keys = keys
+        parts = []
+
+        async def produce():
+            sr = None
+            for index, (sentence, sentence_key) in enumerate(zip(sentences, sentence_keys)):
+                with timer.stage("cache"):
+                    cached = self.synthesis_cache.get(sentence_key)
+                if cached is not None:
+                    samples, sr = cached
+                    parts.append(samples)
+                    if not progress(cached):
+                        return None
+                else:
+                    with timer.stage("phonemize"):
+                        phonemes = self.phoneme_cache.phonemes(sentence, "en-us")
+                    stream = self.pipeline.create_stream(phonemes, voice=voice_blend, speed=speed, lang="en-us", is_phonemes=True)
+                    sentence_parts = []
+                    try:
+                        waiting = time.perf_counter()
+                        async for samples, sr in stream:
+                            timer.add("inference", (time.perf_counter() - waiting) * 1000)
+                            sentence_parts.append(samples)
+                            parts.append(samples)
+                            if not progress((samples, sr)):
+                                return None
+                            waiting = time.perf_counter()
+                    finally:
+                        await stream.aclose()
+                    if sentence_parts:
+                        self.synthesis_cache.put(sentence_key, np.concatenate(sentence_parts), sr)
+                if index < len(sentences) - 1:
+                    parts.append(np.zeros(int(SENTENCE_PAUSE * sr), dtype=np.float32))
+                    if not progress((parts[-1], sr)):
+                        return None
+            return sr
+
+        sr = asyncio.run(produce())
+        if sr is None or not parts:
+            return None
+        samples = np.concatenate(parts)
+        self.synthesis_cache.put(key, samples, sr)
+        return samples, sr
+
+    def current_slider_values(self):
+        """Integer slider values aligned with self.blender.names (needs the loaded model)."""
+        return self.weight_model.values[self.blend_columns]
+
+    def blend(self, slider_values):
+        """Style vector for slider values aligned with self.blender.names; presets come precomputed."""
+        voice_blend = self.config_library.cached_blend(slider_values, self.normalize_sliders)
+        if voice_blend is None:
+            voice_blend = self.blender.blend(scale_weights(slider_values, self.normalize_sliders))
+        return voice_blend
+
+    def render_text(self, keys, voice_blend, speed, timer=None, pipeline=None, workers=1, backfill=False):
+        """Render a text through the synthesis cache; keys come from text_keys().
+
+        A text none of whose sentences is cached yet is rendered in one call,
+        as that is faster than a call per sentence; with backfill set, its
+        sentences are cached afterwards on the background thread. Once some
+        are cached, only the others reach the model, on up to `workers`
+        threads, and the parts are spliced in order. Either way the whole is
+        cached under the text's key. Safe to call from worker threads.
+        """
+        key, text, sentences, sentence_keys = keys
+        timer = timer or StageTimer("render")
+        parts = [None]
+        with timer.stage("cache"):
+            cached = self.synthesis_cache.get(key)
+            if cached is None and len(sentences) > 1:
+                parts = [self.synthesis_cache.get(sentence_key) for sentence_key in sentence_keys]
+        if cached is not None:
+            return cached
+        if not any(part is not None for part in parts):
+            samples, sr = self.synthesize(text, voice_blend, speed, timer=timer, pipeline=pipeline)
+            if backfill and len(sentences) > 1:
+                self.cache_sentences(keys, voice_blend, speed)
+        else:
+            def render(index):
+                samples, sr = self.synthesize(sentences[index], voice_blend, speed, timer=timer, pipeline=pipeline)
+                self.synthesis_cache.put(sentence_keys[index], samples, sr)
+                return samples, sr
+
+            missing = [index for index, part in enumerate(parts) if part is None]
+            for index, part in zip(missing, render_chunks(render, missing, workers)):
+                parts[index] = part
+            sr = parts[0][1]
+            samples = join_audio([part for part, _ in parts], sr, gap=SENTENCE_PAUSE)
+        self.synthesis_cache.put(key, samples, sr)
+        return samples, sr
+
+    def cache_sentences(self, keys, voice_blend, speed):
+        """Render and cache the sentences of a text on the background thread, so an edit re-renders only what it touched."""
+        _, _, sentences, sentence_keys = keys
+
+        def job(progress):
+            for sentence, sentence_key in zip(sentences, sentence_keys):
+                if not progress(None):
+                    return  # Superseded by a newer text or blend
+                self.render_cached(sentence_key, sentence, voice_blend, speed)
+
+        self.synthesis_worker.submit("sentences", job, priority=PRIORITY_BACKGROUND)
+
+    def text_keys(self, text, role="preview", values=None):
+        """(key, text, sentences, sentence keys) of a text, for the current or the given slider values."""
+        sentences = split_sentences(text)
+        return (
+            self.synthesis_key(text, role, values), text, sentences,
+            [self.synthesis_key(sentence, role, values) for sentence in sentences]
+        )
 
-        temp_file = "temp_preview.wav"
+    def synthesis_key(self, text, role="preview", values=None):
+        values = self.weight_model.values if values is None else values
+        model = (self.variants.model_path(role), self.voices_checksum)
+        return make_key(
+            text, dict(zip(self.voices, values)), self.normalize_sliders, self.speed, "en-us", self.variants.roles[role], model
+        )
 
-        try:
-            # Synthesize audio
-            samples, sr = self.pipeline.create(text, voice=voice_blend, speed=self.speed, lang="en-us")
-            sf.write(temp_file, samples, sr)
-
-            # Play audio
-            pygame.mixer.init()
-            pygame.mixer.music.load(temp_file)
-            pygame.mixer.music.play()
-            if not auto_loop:
-                while pygame.mixer.music.get_busy():
-                    QApplication.processEvents()
-        except Exception as e:
-            if not auto_loop:
-                QMessageBox.critical(self, "Error", f"Failed to preview: {str(e)}")
+    def render_cached(self, key, text, voice_blend, speed, timer=None, pipeline=None, store=True):
+        """Synthesize through the synthesis cache, adding the result unless store is False.
+
+        Safe to call from worker threads.
+        """
+        timer = timer or StageTimer("render")
+        with timer.stage("cache"):
+            cached = self.synthesis_cache.get(key)
+        if cached is not None:
+            return cached
+        samples, sr = self.synthesize(text, voice_blend, speed, timer=timer, pipeline=pipeline)
+        if store:
+            self.synthesis_cache.put(key, samples, sr)
+        return samples, sr
+
+    def synthesize(self, text, voice_blend, speed, lang="en-us", timer=None, pipeline=None):
+        """Run the acoustic model on cached phonemes, with the preview pipeline by default.
+
+        Safe to call from worker threads.
+        """
+        timer = timer or StageTimer("synthesize")
+        pipeline = pipeline or self.pipeline
+        with timer.stage("phonemize"):
+            phonemes = self.phoneme_cache.phonemes(text, lang)
+        with timer.stage("inference"):
+            return pipeline.create(phonemes, voice=voice_blend, speed=speed, lang=lang, is_phonemes=True)
+
+    def update_cache_status(self):
+        stats = self.synthesis_cache.stats()
+        self.cache_status_label.setText(
+            f"Cache: {stats['hits'] + stats['disk_hits']} hits, {stats['misses']} misses, "
+            f"{stats['evictions']} evictions, {stats['bytes'] / (1024 * 1024):.1f} MB"
+        )
 
     def synthesize_and_save(self):
+        if self.pipeline is None:
+            return  # Model still loading
         # Stop auto-loop if running
         if self.auto_loop:
             self.auto_loop_cb.setChecked(False)
@@ -656,52 +1858,228 @@ class KokoroVoiceBlender(QMainWindow):
             QMessageBox.critical(self, "Error", "Please enter text to synthesize.")
             return
 
-        # Get normalized values (0-1)
-        voice_ratios = {voice: slider.value() / 100 for voice, slider in self.sliders.items()}
-        active_voices = [(voice, ratio) for voice, ratio in voice_ratios.items() if ratio > 0]
+        # Get slider values (0-100), aligned with the blend matrix
+        slider_values = self.current_slider_values()
 
-        if not active_voices:
+        if not slider_values.any():
             QMessageBox.critical(self, "Error", "At least one voice ratio must be greater than 0.")
             return
 
-        # Calculate total sum of ratios
-        total = sum(ratio for _, ratio in active_voices)
-        if total == 0:
-            total = 1  # Prevent division by zero
-
-        # Scale ratios if normalization is disabled
-        scaled_voices = [(voice, ratio / total if not self.normalize_sliders else ratio) for voice, ratio in active_voices]
-
         # Create voice blending
-        try:
-            voice_blend = sum(
-                self.pipeline.voices[voice] * ratio
-                for voice, ratio in scaled_voices
+        timer = StageTimer("save")
+        with timer.stage("blend"):
+            voice_blend = self.blend(slider_values)
+
+        # The format follows the extension of the chosen file
+        output_file, selected_filter = QFileDialog.getSaveFileName(self, "Save Audio", self.output_path, AUDIO_FILE_FILTER)
+        if not output_file:
+            return
+        if os.path.splitext(output_file)[1].lower() not in AUDIO_FORMATS:
+            output_file += selected_filter[selected_filter.index("*") + 1:-1]
+        self.output_path = output_file
+        speed = self.speed
+        # Saves may run on a more precise model variant than previews
+        save_model = self.variants.model_path("save")
+
+        def save_pipeline():
+            with timer.stage("load_model"):
+                return self.pipeline_for(save_model)
+
+        if self.long_form_cb.isChecked():
+            chunks = split_long_text(text)
+            chunk_keys = [self.synthesis_key(chunk, "save") for chunk in chunks]
+            workers = self.chunk_workers_spinbox.value()
+            join_seconds = self.chunk_gap_spinbox.value() / 1000
+            gap, crossfade = (0.0, join_seconds) if self.crossfade_cb.isChecked() else (join_seconds, 0.0)
+        else:
+            # Sentence by sentence with the preview's pause, so sentences already previewed are reused
+            _, _, chunks, chunk_keys = self.text_keys(text, "save")
+            workers, gap, crossfade = 1, SENTENCE_PAUSE, 0.0
+
+        def render(progress):
+            # Chunks go to disk in order as they finish, so memory stays flat on book-length texts. Cached
+            # renders are reused, but new ones are not stored: an export would only push previews out of the cache
+            pipeline = save_pipeline()
+            parts = iter_chunks(
+                lambda index: self.render_cached(chunk_keys[index], chunks[index], voice_blend, speed, timer, pipeline, store=False),
+                range(len(chunks)), workers
             )
-        except KeyError as e:
-            QMessageBox.critical(self, "Error", f"Voice not found: {str(e)}")
+            writer = None
+            try:
+                for done, (samples, sr) in enumerate(parts, start=1):
+                    if writer is None:
+                        writer = StreamingAudioWriter(output_file, sr, gap=gap, crossfade=crossfade)
+                    with timer.stage("write"):
+                        writer.write(samples)
+                    if not progress((done, len(chunks))):
+                        writer.abort()
+                        return None  # Cancelled
+                with timer.stage("write"):
+                    return output_file, writer.close()
+            except Exception:
+                if writer is not None:
+                    writer.abort()
+                raise
+            finally:
+                parts.close()
+
+        self.synthesize_btn.setEnabled(False)
+        self.save_progress.setRange(0, len(chunks))
+        self.save_progress.setValue(0)
+        self.save_progress.setVisible(True)
+        self.cancel_save_btn.setVisible(True)
+        render = self.profile_if_requested(render, "save")
+        self.synthesis_worker.submit("save", render, priority=PRIORITY_NORMAL, context={
+            "timer": timer, "text_chars": len(text), "chunks": len(chunks), "variant": self.variants.roles["save"]
+        })
+
+    def cancel_save(self):
+        self.synthesis_worker.cancel("save")
+        self.finish_save()
+        self.statusBar().showMessage("Synthesis cancelled")
+
+    def finish_save(self):
+        self.synthesize_btn.setEnabled(True)
+        self.save_progress.setVisible(False)
+        self.cancel_save_btn.setVisible(False)
+
+    def on_synthesis_progress(self, slot, generation, payload, context):
+        if not self.synthesis_worker.is_current(slot, generation):
             return
+        if slot == "preview":
+            self.queue_stream_chunk(generation, *payload, context)
+        elif slot == "save":
+            done, total = payload
+            self.save_progress.setRange(0, total)
+            self.save_progress.setValue(done)
+        elif slot == "sweep" and self.session_dialog is not None:
+            self.session_dialog.show_sweep_result(*payload)
+        elif slot == "audition":
+            self.show_candidate(*payload)
+
+    def on_synthesis_finished(self, slot, generation, result, context):
+        self.update_cache_status()
+        if not self.synthesis_worker.is_current(slot, generation):
+            if slot == "speculate":
+                # speculate() skipped its turn while this job ran; start on the new buffer now
+                self.schedule_speculation()
+            return  # Stale result of a superseded job
+        if slot == "load":
+            self.on_model_loaded(*result)
+        elif slot == "warmup":
+            timer, samples, sr = result
+            self.log_timing(timer, len(samples) / sr)
+        elif slot == "quantize":
+            if self.variants_dialog is not None:
+                self.variants_dialog.finish_quantize(result)
+        elif slot == "compare":
+            report = result[0]
+            print(f"A/B render: {json.dumps(report)}")
+            if self.variants_dialog is not None:
+                self.variants_dialog.finish_compare(*result)
+        elif slot == "sweep":
+            print("Thread sweep: " + ", ".join(f"{threads} threads {ms:.0f} ms" for threads, ms in result.items()))
+            if self.session_dialog is not None:
+                self.session_dialog.finish_sweep(result)
+        elif slot == "audition" and result is not None:
+            self.statusBar().showMessage(f"Audition: {context['count']} candidates rendered in {result:.1f} s")
+        elif slot == "speculate":
+            self.speculated_keys.add(context["key"])
+            self.speculate()
+        elif slot == "preview" and result is not None:
+            if context.get("streamed"):
+                # Already played chunk by chunk; only the loop still needs the whole render
+                if (context["auto_loop"] or self.auto_loop) and self.stream_generation == generation:
+                    self.player.loop(*result, repeat=self.continuous_loop, playing=True)
+            else:
+                self.play_preview(*result, auto_loop=context["auto_loop"], timer=context["timer"])
+            self.log_timing(context["timer"], len(result[0]) / result[1], text_chars=context["text_chars"],
+                            first_audio_ms=context.get("first_audio_ms"), variant=context["variant"])
+        elif slot == "save" and result is not None:
+            self.finish_save()
+            output_file, audio_seconds = result
+            self.log_timing(context["timer"], audio_seconds, text_chars=context["text_chars"], chunks=context["chunks"],
+                            variant=context["variant"])
+            self.statusBar().showMessage(f"Audio saved as {output_file}")
+            if self.play_after_save_cb.isChecked():
+                try:
+                    import soundfile as sf
+                    samples, sr = sf.read(output_file, dtype="float32")
+                    self.stream_generation = None
+                    self.player.play(samples, sr)
+                except Exception as e:
+                    QMessageBox.critical(self, "Error", f"Failed to play {output_file}: {str(e)}")
+
+    def on_synthesis_failed(self, slot, generation, error, context):
+        if not self.synthesis_worker.is_current(slot, generation):
+            if slot == "speculate":
+                self.schedule_speculation()
+            return
+        if slot == "load":
+            self.statusBar().showMessage("Model failed to load")
+            QMessageBox.critical(self, "Error", f"Failed to initialize Kokoro pipeline: {error}")
+        elif slot == "preview":
+            if not context["auto_loop"]:
+                QMessageBox.critical(self, "Error", f"Failed to preview: {error}")
+        elif slot == "save":
+            self.finish_save()
+            QMessageBox.critical(self, "Error", f"Failed to synthesize: {error}")
+        elif slot == "warmup":
+            print(f"Warm-up render failed: {error}")
+        elif slot == "presets":
+            print(f"Failed to precompute preset blends: {error}")
+        elif slot == "sentences":
+            print(f"Failed to cache sentences: {error}")
+        elif slot == "speculate":
+            # Not retried: the same blend would fail again; the next change starts over
+            print(f"Speculative render failed: {error}")
+        elif slot == "audition":
+            QMessageBox.critical(self, "Error", f"Failed to render audition candidates: {error}")
+        elif slot == "quantize" and self.variants_dialog is not None:
+            self.variants_dialog.finish_quantize(None, error=error)
+        elif slot == "compare" and self.variants_dialog is not None:
+            self.variants_dialog.finish_compare(error=error)
+        elif slot == "sweep":
+            print(f"Thread sweep failed: {error}")
+            if self.session_dialog is not None:
+                self.session_dialog.finish_sweep({})
+
+    def queue_stream_chunk(self, generation, samples, sr, context):
+        try:
+            if generation != self.stream_generation:
+                # First chunk of a new stream replaces whatever is still playing
+                self.stream_generation = generation
+                with context["timer"].stage("playback"):
+                    self.player.play(samples, sr)
+                time_to_first_audio = (time.perf_counter() - context["started"]) * 1000
+                context["first_audio_ms"] = round(time_to_first_audio, 1)
+                self.statusBar().showMessage(f"Time to first audio: {time_to_first_audio:.0f} ms")
+            else:
+                self.player.append(samples, sr)
+        except Exception as e:
+            if not context["auto_loop"]:
+                QMessageBox.critical(self, "Error", f"Failed to preview: {str(e)}")
 
-        output_file = "output_blended.wav"
-
+    def play_preview(self, samples, sr, auto_loop=False, timer=None):
+        timer = timer or StageTimer("preview")
         try:
-            # Synthesize audio
-            samples, sr = self.pipeline.create(text, voice=voice_blend, speed=self.speed, lang="en-us")
-            sf.write(output_file, samples, sr)
-
-            # Play audio
-            pygame.mixer.init()
-            pygame.mixer.music.load(output_file)
-            pygame.mixer.music.play()
-            while pygame.mixer.music.get_busy():
-                QApplication.processEvents()
-
-            QMessageBox.information(self, "Success", f"Audio saved as {output_file}")
+            self.stream_generation = None
+            with timer.stage("playback"):
+                if auto_loop:
+                    crossfade = LOOP_CROSSFADE if self.loop_crossfade_cb.isChecked() else 0.0
+                    self.player.loop(samples, sr, repeat=self.continuous_loop, crossfade=crossfade)
+                else:
+                    self.player.play(samples, sr)
+                    if self.auto_loop:
+                        # Keep looping what was just previewed
+                        self.player.loop(samples, sr, repeat=self.continuous_loop, playing=True)
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to synthesize: {str(e)}")
+            if not auto_loop:
+                QMessageBox.critical(self, "Error", f"Failed to preview: {str(e)}")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = KokoroVoiceBlender()
     window.show()
+    QTimer.singleShot(0, window.mark_window_shown)
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""Tests of StreamingAudioWriter against the in-memory join_audio."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from kokoro_blender_core import StreamingAudioWriter, join_audio
+
+SR = 24000
+PCM16_STEP = 1 / 32767
+
+
+def parts(lengths, seed=0):
+    rng = np.random.default_rng(seed)
+    return [(0.5 * rng.uniform(-1, 1, length)).astype(np.float32) for length in lengths]
+
+
+@pytest.mark.parametrize("gap, crossfade", [(0.0, 0.0), (0.25, 0.0), (0.0, 0.05), (0.0, 0.5)])
+@pytest.mark.parametrize("lengths", [[24000], [12000, 30000, 6000], [24000, 600, 800, 24000]])
+def test_streamed_file_matches_join_audio(tmp_path, gap, crossfade, lengths):
+    chunks = parts(lengths)
+    path = str(tmp_path / "out.wav")
+    with StreamingAudioWriter(path, SR, gap=gap, crossfade=crossfade) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    expected = join_audio(chunks, SR, gap=gap, crossfade=crossfade)
+    written, sr = sf.read(path, dtype="float32")
+    assert sr == SR
+    assert len(written) == len(expected)
+    assert np.max(np.abs(written - expected)) <= PCM16_STEP
+    assert writer.frames / SR == pytest.approx(len(expected) / SR)
+
+
+@pytest.mark.parametrize("extension", [".wav", ".flac", ".ogg"])
+def test_formats_follow_the_extension(tmp_path, extension):
+    path = str(tmp_path / f"out{extension}")
+    writer = StreamingAudioWriter(path, SR)
+    writer.write(parts([4800])[0])
+    assert writer.close() == pytest.approx(0.2)
+    assert sf.info(path).frames == 4800
+    assert os.listdir(tmp_path) == [f"out{extension}"]
+
+
+def test_unknown_extension_is_refused(tmp_path):
+    with pytest.raises(ValueError):
+        StreamingAudioWriter(str(tmp_path / "out.mp3"), SR)
+    assert os.listdir(tmp_path) == []
+
+
+def test_abort_leaves_no_file(tmp_path):
+    path = str(tmp_path / "out.wav")
+    writer = StreamingAudioWriter(path, SR, crossfade=0.05)
+    writer.write(parts([24000])[0])
+    writer.abort()
+    assert os.listdir(tmp_path) == []
+
+
+def test_abort_keeps_an_existing_file(tmp_path):
+    path = str(tmp_path / "out.wav")
+    sf.write(path, np.zeros(100, dtype=np.float32), SR)
+    with pytest.raises(RuntimeError):
+        with StreamingAudioWriter(path, SR) as writer:
+            writer.write(parts([24000])[0])
+            raise RuntimeError("render failed")
+    assert os.listdir(tmp_path) == ["out.wav"]
+    assert sf.info(path).frames == 100
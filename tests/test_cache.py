@@ -0,0 +1,85 @@
+"""Tests of the synthesis cache's memory budget and disk tier."""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from kokoro_blender_cache import SynthesisCache, make_key
+
+SR = 24000
+
+
+def samples(n, value=0.1):
+    return np.full(n, value, dtype=np.float32)
+
+
+def key(text, model=None):
+    return make_key(text, {"af_bella": 60, "am_adam": 40}, True, 1.0, model=model)
+
+
+def disk_files(path):
+    return [entry for entry in os.scandir(path) if entry.name.endswith(".npz")]
+
+
+def test_memory_budget_evicts_least_recently_used():
+    cache = SynthesisCache(max_bytes=3 * 4000)
+    for name in "abc":
+        cache.put(key(name), samples(1000), SR)
+    assert cache.get(key("a")) is not None  # Now the most recently used
+    cache.put(key("d"), samples(1000), SR)
+    assert cache.get(key("b")) is None
+    assert all(cache.get(key(name)) is not None for name in "acd")
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 3 * 4000 <= cache.max_bytes
+
+
+def test_oversized_result_is_not_kept_in_memory():
+    cache = SynthesisCache(max_bytes=4000)
+    cache.put(key("small"), samples(500), SR)
+    cache.put(key("huge"), samples(5000), SR)
+    assert cache.get(key("huge")) is None
+    assert cache.get(key("small")) is not None
+
+
+def test_replacing_an_entry_keeps_the_byte_count():
+    cache = SynthesisCache()
+    cache.put(key("a"), samples(1000), SR)
+    cache.put(key("a"), samples(2000), SR)
+    assert cache.stats()["bytes"] == 2000 * 4
+    assert len(cache.get(key("a"))[0]) == 2000
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    cache = SynthesisCache(disk_dir=str(tmp_path))
+    cache.put(key("hello"), samples(1000, 0.25), SR)
+    reloaded = SynthesisCache(disk_dir=str(tmp_path))
+    audio, sr = reloaded.get(key("hello"))
+    assert sr == SR and np.array_equal(audio, samples(1000, 0.25))
+    assert reloaded.stats()["disk_hits"] == 1
+
+
+def test_disk_tier_is_keyed_on_the_model_files(tmp_path):
+    cache = SynthesisCache(disk_dir=str(tmp_path))
+    cache.put(key("hello", model=("kokoro.onnx", "old-voices")), samples(1000), SR)
+    reloaded = SynthesisCache(disk_dir=str(tmp_path))
+    assert reloaded.get(key("hello", model=("kokoro.onnx", "new-voices"))) is None
+    assert reloaded.get(key("hello", model=("kokoro.onnx", "old-voices"))) is not None
+
+
+def test_disk_trim_keeps_budget_and_newest_entries(tmp_path):
+    cache = SynthesisCache(disk_dir=str(tmp_path), max_disk_bytes=20000)
+    for index in range(12):
+        cache.put(key(f"sentence {index}"), samples(1000), SR)
+        time.sleep(0.01)  # Distinct modification times, so the trim order is defined
+    files = disk_files(tmp_path)
+    total = sum(entry.stat().st_size for entry in files)
+    assert 0 < total <= cache.max_disk_bytes
+    assert cache.disk_bytes == total  # Tracked incrementally, matches the directory
+    assert 0 < len(files) < 12
+    cache.clear()
+    assert cache.get(key("sentence 11")) is not None
+    assert cache.get(key("sentence 0")) is None
@@ -0,0 +1,176 @@
+"""End-to-end tests of kokoro_blender_server against the stub backend.
+
+Each test starts a SynthesisServer on an ephemeral localhost port and talks
+HTTP to it with plain asyncio streams:
+
+    python -m pytest tests
+"""
+import asyncio
+import json
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import kokoro_blender_stub
+from kokoro_blender_core import VOICES, ConfigLibrary, VoiceBlender, VoiceStore, file_checksum
+from kokoro_blender_server import SynthesisServer
+
+WEIGHTS = {VOICES[0]: 0.6, VOICES[1]: 0.4}
+
+
+@pytest.fixture
+def start_server(tmp_path):
+    """Factory for a running server; returns (server, port) inside the test's event loop."""
+    voices_path = kokoro_blender_stub.write_voices(str(tmp_path / "voices.npz"))
+    config_dir = tmp_path / "configs"
+    config_dir.mkdir()
+    (config_dir / "duo.json").write_text(json.dumps({"voice_weights": WEIGHTS, "normalize_sliders": True}))
+    started = []
+
+    async def start(latency=0.0, **options):
+        kokoro_blender_stub.install(latency=latency)
+        pipeline = kokoro_blender_stub.StubKokoro(voices_path=voices_path)
+        blender = VoiceBlender(VOICES, VoiceStore(voices_path, str(tmp_path / "store")))
+        server = SynthesisServer(
+            pipeline, blender, ConfigLibrary(str(config_dir), VOICES), file_checksum(voices_path), **options
+        )
+        server.start()
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        started.append((server, listener))
+        return server, listener.sockets[0].getsockname()[1]
+
+    yield start
+    for server, listener in started:
+        listener.close()
+        for task in server.tasks:
+            task.cancel()
+        server.executor.shutdown(wait=True)
+
+
+async def request(port, method, path, payload=None):
+    """(status, headers, body) of one request; payload is sent as JSON unless it is bytes, a chunked body is decoded."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    if isinstance(payload, bytes):
+        body = payload
+    else:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = {name.lower(): value.strip() for name, _, value in (line.partition(":") for line in lines[1:])}
+    if headers.get("transfer-encoding") == "chunked":
+        data = b""
+        while True:
+            size, _, body = body.partition(b"\r\n")
+            size = int(size, 16)
+            if size == 0:
+                break
+            data, body = data + body[:size], body[size + 2:]
+        body = data
+    return status, headers, body
+
+
+async def wait_until(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+
+def test_synthesize_streams_wav(start_server):
+    async def run():
+        server, port = await start_server()
+        status, headers, body = await request(port, "POST", "/synthesize", {"text": "Hello there. How are you?", "voice_weights": WEIGHTS})
+        assert status == 200
+        assert headers["content-type"] == "audio/wav"
+        assert headers["x-coalesced"] == "0"
+        assert body[:4] == b"RIFF" and body[8:12] == b"WAVE"
+        assert struct.unpack("<I", body[24:28])[0] == kokoro_blender_stub.SAMPLE_RATE
+        assert len(body) > 44 and (len(body) - 44) % 2 == 0
+
+        status, _, by_config = await request(port, "POST", "/synthesize", {"text": "Hello there. How are you?", "config": "duo"})
+        assert status == 200
+        assert len(by_config) == len(body)
+    asyncio.run(run())
+
+
+def test_identical_requests_share_one_render(start_server):
+    async def run():
+        server, port = await start_server(latency=0.1)
+        payload = {"text": "The same sentence twice.", "voice_weights": WEIGHTS}
+        first = asyncio.create_task(request(port, "POST", "/synthesize", payload))
+        await wait_until(lambda: server.inflight)
+        second = await request(port, "POST", "/synthesize", payload)
+        first = await first
+        assert first[0] == second[0] == 200
+        assert {first[1]["x-coalesced"], second[1]["x-coalesced"]} == {"0", "1"}
+        assert first[2] == second[2]
+        assert server.counters["renders"] == 1
+        assert server.counters["coalesced"] == 1
+    asyncio.run(run())
+
+
+def test_full_queue_answers_503(start_server):
+    async def run():
+        server, port = await start_server(latency=0.2, workers=1, queue_size=1)
+        running = asyncio.create_task(request(port, "POST", "/synthesize", {"text": "First.", "voice_weights": WEIGHTS}))
+        await wait_until(lambda: server.inflight and server.queue.empty())
+        waiting = asyncio.create_task(request(port, "POST", "/synthesize", {"text": "Second.", "voice_weights": WEIGHTS}))
+        await wait_until(lambda: server.queue.full())
+        status, headers, body = await request(port, "POST", "/synthesize", {"text": "Third.", "voice_weights": WEIGHTS})
+        assert status == 503
+        assert headers["retry-after"] == "1"
+        assert "full" in json.loads(body)["error"]
+        assert (await running)[0] == (await waiting)[0] == 200
+        assert server.counters["rejected"] == 1
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("method, path, payload, status", [
+    ("POST", "/synthesize", {"voice_weights": WEIGHTS}, 400),
+    ("POST", "/synthesize", {"text": "Hi.", "voice_weights": {"xx_nobody": 1.0}}, 400),
+    ("POST", "/synthesize", {"text": "Hi.", "voice_weights": {VOICES[0]: 0.0}}, 400),
+    ("POST", "/synthesize", {"text": "Hi.", "voice_weights": WEIGHTS, "speed": 9}, 400),
+    ("POST", "/synthesize", {"text": "Hi.", "voice_weights": WEIGHTS, "speed": 0.3}, 400),
+    ("POST", "/synthesize", {"text": "Hi.", "voice_weights": {VOICES[0]: -0.5, VOICES[1]: 1.0}}, 400),
+    ("POST", "/synthesize", {"text": "Hi.", "voice_weights": {VOICES[0]: "0.5"}}, 400),
+    ("POST", "/synthesize", b'{"text": "Hi.", "voice_weights": {"%s": 1e400}}' % VOICES[0].encode(), 400),
+    ("POST", "/synthesize", {"text": "Hi.", "config": "missing"}, 404),
+    ("GET", "/nowhere", None, 404),
+    ("GET", "/synthesize", None, 405),
+])
+def test_request_errors(start_server, method, path, payload, status):
+    async def run():
+        server, port = await start_server()
+        response_status, headers, body = await request(port, method, path, payload)
+        assert response_status == status
+        assert headers["content-type"] == "application/json"
+        assert json.loads(body)["error"]
+        assert server.counters["bad_requests"] == (1 if status == 400 else 0)
+    asyncio.run(run())
+
+
+def test_metrics(start_server):
+    async def run():
+        server, port = await start_server()
+        await request(port, "POST", "/synthesize", {"text": "One. Two.", "voice_weights": WEIGHTS})
+        status, _, body = await request(port, "GET", "/metrics")
+        assert status == 200
+        metrics = json.loads(body)
+        assert metrics["requests"] == 1
+        assert metrics["renders"] == 1
+        assert metrics["audio_seconds"] > 0
+        assert metrics["queue_depth"] == 0 and metrics["in_flight"] == 0
+        assert metrics["first_chunk_ms_p50"] is not None
+        assert (await request(port, "GET", "/health"))[0] == 200
+    asyncio.run(run())
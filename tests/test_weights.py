@@ -0,0 +1,77 @@
+"""Tests of the integer slider arithmetic in kokoro_blender_core."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from kokoro_blender_core import WeightModel, apportion, draw_random_values, normalize_percent
+
+
+@pytest.mark.parametrize("weights, total", [
+    ([1, 1, 1], 100),
+    ([1, 2, 3, 4, 5, 6, 7], 100),
+    ([0.333, 0.333, 0.334], 100),
+    ([5, 0, 5], 37),
+    ([1e-9, 1, 1e9], 100),
+])
+def test_apportion_sums_to_total_within_one_of_exact(weights, total):
+    shares = apportion(weights, total)
+    exact = np.asarray(weights, dtype=np.float64) * total / np.sum(weights)
+    assert shares.sum() == total
+    assert np.all(np.abs(shares - exact) < 1)
+    assert np.all(shares[np.asarray(weights) == 0] == 0)
+
+
+def test_apportion_of_nothing_is_zero():
+    assert not apportion([0, 0, 0], 100).any()
+    assert not apportion([1, 2], 0).any()
+
+
+def test_normalize_percent_sums_to_100():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        values = rng.integers(0, 101, 54) * (rng.random(54) < 0.2)
+        normalized = normalize_percent(values)
+        assert normalized.sum() == (100 if values.any() else 0)
+        assert np.all(normalized[values == 0] == 0)
+
+
+def test_rebalance_keeps_moved_voice_and_sums_to_100():
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        model = WeightModel(20)
+        model.assign(normalize_percent(rng.integers(1, 101, 20) * (rng.random(20) < 0.4) + np.eye(20, dtype=int)[0]))
+        model.values[0] = int(rng.integers(0, 101))
+        before = model.values.copy()
+        changed = model.rebalance(0)
+        assert model.values[0] == before[0]
+        assert model.values.sum() == 100 or np.count_nonzero(before) == 1
+        assert set(changed) == set(np.flatnonzero(model.values != before))
+
+
+def test_rebalance_keeps_proportions_of_the_others():
+    model = WeightModel(4)
+    model.assign([40, 20, 40, 0])
+    model.values[0] = 70
+    model.rebalance(0)
+    assert list(model.values) == [70, 10, 20, 0]
+
+
+def test_rebalance_alone_leaves_the_value():
+    model = WeightModel(3)
+    model.assign([0, 35, 0])
+    assert len(model.rebalance(1)) == 0
+    assert list(model.values) == [0, 35, 0]
+
+
+def test_draw_random_values_normalized():
+    np.random.seed(0)
+    for count in (1, 2, 5, 20):
+        values = draw_random_values(54, count=count)
+        assert values.sum() == 100
+        assert np.count_nonzero(values) <= count
+    values = draw_random_values(54, active=[3, 7, 9])
+    assert values.sum() == 100 and set(np.flatnonzero(values)) <= {3, 7, 9}